@@ -1,20 +1,36 @@
 import sys
 import os
+import io
+import time
 import uuid
+import shutil
+import tempfile
+import cProfile
+import threading
 from datetime import datetime
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "src"))
 
-from flask import Flask, jsonify, request, render_template, send_from_directory
+from flask import Flask, Response, g, jsonify, request, render_template, send_from_directory
 from werkzeug.utils import secure_filename
-from todo import TodoManager
+from todo import metrics
+from todo.tenants import TenantManagers, InvalidTenantError, DEFAULT_TENANT, upload_dir, tenant_for_user
+from todo.importer import import_todos, detect_format, ImportFormatError, FORMATS, DEFAULT_BATCH_SIZE
 from todoist_sync import TodoistSync, TodoistSyncError
 import requests
 
 app = Flask(__name__)
-manager = TodoManager()
-syncer = TodoistSync(manager)
-last_sync_time = None
+last_sync_times = {}  # tenant -> ISO tidspunkt (kun DEFAULT_TENANT synkroniserer)
+
+# Hver tenant (header X-Todo-Tenant eller basic auth-brugernavn) får sin egen
+# store; uden tenant bruges den delte todos.json som hidtil.
+TENANT_HEADER = "X-Todo-Tenant"
+DATA_DIR = os.environ.get("TODO_DATA_DIR", os.path.dirname(os.path.abspath(__file__)))
+tenants = TenantManagers(
+    data_dir=DATA_DIR,
+    max_open=int(os.environ.get("TODO_MAX_OPEN_TENANTS", "1000")),
+    idle_seconds=float(os.environ.get("TODO_TENANT_IDLE_SECONDS", "600")),
+)
 
 UPLOAD_FOLDER = os.path.join(os.path.dirname(__file__), "uploads")
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
@@ -22,11 +38,83 @@ os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 ALLOWED_EXTENSIONS = {"jpg", "jpeg", "png", "gif", "pdf", "docx", "txt"}
 MAX_FILE_SIZE = 10 * 1024 * 1024  # 10 MB
 
+# Opt-in profilering: sæt TODO_PROFILE_SLOW_MS for at gemme cProfile-output
+# for requests der tager længere tid end grænsen.
+PROFILE_SLOW_MS = float(os.environ.get("TODO_PROFILE_SLOW_MS", "0") or 0)
+PROFILE_FOLDER = os.environ.get("TODO_PROFILE_DIR", os.path.join(os.path.dirname(__file__), "profiles"))
+# Kun én request profileres ad gangen: fra Python 3.12 fejler en anden samtidig
+# cProfile.enable(), og profilen indeholder alle tråde. Requests der kommer
+# mens låsen er optaget, profileres ikke.
+_profile_lock = threading.Lock()
+
+REQUEST_SECONDS = metrics.histogram(
+    "todo_http_request_seconds", "Latency of HTTP requests by route.", ["method", "route", "status"])
+
 
 def allowed_file(filename):
     return "." in filename and filename.rsplit(".", 1)[1].lower() in ALLOWED_EXTENSIONS
 
 
+def current_tenant():
+    tenant = request.headers.get(TENANT_HEADER)
+    if not tenant and request.authorization and request.authorization.username:
+        tenant = tenant_for_user(request.authorization.username)
+    return tenant or DEFAULT_TENANT
+
+
+def tenant_upload_folder():
+    """Upload-mappe for den aktuelle tenant; filer deles aldrig på tværs."""
+    return upload_dir(UPLOAD_FOLDER, current_tenant())
+
+
+def tenant_manager():
+    """Context manager med eksklusiv adgang til den aktuelle tenants TodoManager."""
+    return tenants.checkout(current_tenant())
+
+
+@app.errorhandler(InvalidTenantError)
+def invalid_tenant(e):
+    return jsonify({"error": str(e)}), 400
+
+
+@app.before_request
+def start_request_timer():
+    g.request_start = time.perf_counter()
+    if PROFILE_SLOW_MS > 0 and _profile_lock.acquire(blocking=False):
+        g.profiler = cProfile.Profile()
+        g.profiler.enable()
+
+
+@app.after_request
+def record_request_metrics(response):
+    elapsed = time.perf_counter() - g.get("request_start", time.perf_counter())
+    route = request.url_rule.rule if request.url_rule else "<unmatched>"
+    REQUEST_SECONDS.observe(elapsed, method=request.method, route=route, status=response.status_code)
+
+    profiler = g.get("profiler")
+    if profiler is not None:
+        profiler.disable()
+        if elapsed * 1000 >= PROFILE_SLOW_MS:
+            os.makedirs(PROFILE_FOLDER, exist_ok=True)
+            name = secure_filename(f"{datetime.now():%Y%m%d-%H%M%S-%f}_{request.method}_{route}") + ".prof"
+            profiler.dump_stats(os.path.join(PROFILE_FOLDER, name))
+    return response
+
+
+@app.teardown_request
+def release_profiler(exc):
+    # teardown kører også når requesten fejler, så låsen altid frigives
+    profiler = g.pop("profiler", None)
+    if profiler is not None:
+        profiler.disable()
+        _profile_lock.release()
+
+
+@app.route("/metrics")
+def metrics_endpoint():
+    return Response(metrics.render(), mimetype="text/plain; version=0.0.4")
+
+
 @app.route("/")
 def index():
     return render_template("index.html")
@@ -36,7 +124,8 @@ def index():
 
 @app.route("/api/todos")
 def get_todos():
-    return jsonify(manager.list())
+    with tenant_manager() as manager:
+        return jsonify(manager.list())
 
 
 @app.route("/api/todos", methods=["POST"])
@@ -45,25 +134,67 @@ def add_todo():
     text = data.get("text", "").strip()
     if not text:
         return jsonify({"error": "text is required"}), 400
-    todo = manager.add(
-        text,
-        category=data.get("category", ""),
-        priority=data.get("priority", "Medium"),
-        deadline=data.get("deadline", ""),
-    )
+    with tenant_manager() as manager:
+        todo = manager.add(
+            text,
+            category=data.get("category", ""),
+            priority=data.get("priority", "Medium"),
+            deadline=data.get("deadline", ""),
+        )
     return jsonify(todo), 201
 
 
+@app.route("/api/todos/import", methods=["POST"])
+def import_todos_route():
+    # Enten multipart upload (felt "file") eller rå CSV/NDJSON i request body
+    if "file" in request.files:
+        upload = request.files["file"]
+        raw = upload.stream
+        try:
+            fmt = request.args.get("format") or detect_format(upload.filename)
+        except ImportFormatError as e:
+            return jsonify({"error": str(e)}), 400
+    else:
+        raw = request.stream
+        fmt = request.args.get("format")
+        if not fmt:
+            fmt = "ndjson" if "json" in (request.content_type or "") else "csv"
+
+    if fmt not in FORMATS:
+        return jsonify({"error": f"format skal være en af: {', '.join(FORMATS)}"}), 400
+
+    try:
+        batch_size = int(request.args.get("batch_size", DEFAULT_BATCH_SIZE))
+    except ValueError:
+        return jsonify({"error": "batch_size skal være et tal"}), 400
+    # En batch ligger i hukommelsen, så den må ikke blive større end standarden
+    batch_size = min(batch_size, DEFAULT_BATCH_SIZE)
+
+    # Læs hele bodyen til en midlertidig fil før tenant-låsen tages, så en
+    # langsom klient ikke blokerer tenant'ens øvrige requests under upload
+    with tempfile.TemporaryFile() as spool:
+        shutil.copyfileobj(raw, spool)
+        spool.seek(0)
+        stream = io.TextIOWrapper(spool, encoding="utf-8-sig", newline="")
+        try:
+            with tenant_manager() as manager:
+                result = import_todos(manager, stream, fmt=fmt, batch_size=batch_size)
+        except ImportFormatError as e:
+            return jsonify({"error": str(e)}), 400
+    return jsonify(result), 201
+
+
 @app.route("/api/todos/<int:todo_id>", methods=["PUT"])
 def update_todo(todo_id):
     data = request.get_json(force=True)
-    todo = manager.edit(
-        todo_id,
-        new_text=data.get("text"),
-        category=data.get("category"),
-        priority=data.get("priority"),
-        deadline=data.get("deadline"),
-    )
+    with tenant_manager() as manager:
+        todo = manager.edit(
+            todo_id,
+            new_text=data.get("text"),
+            category=data.get("category"),
+            priority=data.get("priority"),
+            deadline=data.get("deadline"),
+        )
     if todo is None:
         return jsonify({"error": "not found"}), 404
     return jsonify(todo)
@@ -71,7 +202,8 @@ def update_todo(todo_id):
 
 @app.route("/api/todos/<int:todo_id>/toggle", methods=["PATCH"])
 def toggle_todo(todo_id):
-    todo = manager.toggle_done(todo_id)
+    with tenant_manager() as manager:
+        todo = manager.toggle_done(todo_id)
     if todo is None:
         return jsonify({"error": "not found"}), 404
     return jsonify(todo)
@@ -79,7 +211,8 @@ def toggle_todo(todo_id):
 
 @app.route("/api/todos/<int:todo_id>", methods=["DELETE"])
 def delete_todo(todo_id):
-    todo = manager.delete(todo_id)
+    with tenant_manager() as manager:
+        todo = manager.delete(todo_id)
     if todo is None:
         return jsonify({"error": "not found"}), 404
     return jsonify(todo)
@@ -90,76 +223,90 @@ def delete_todo(todo_id):
 
 @app.route("/api/todos/<int:todo_id>/upload", methods=["POST"])
 def upload_file(todo_id):
-    todo = next((t for t in manager.todos if t["id"] == todo_id), None)
-    if todo is None:
-        return jsonify({"error": "not found"}), 404
+    with tenant_manager() as manager:
+        todo = next((t for t in manager.todos if t["id"] == todo_id), None)
+        if todo is None:
+            return jsonify({"error": "not found"}), 404
+
+        if "file" not in request.files:
+            return jsonify({"error": "no file provided"}), 400
 
-    if "file" not in request.files:
-        return jsonify({"error": "no file provided"}), 400
+        file = request.files["file"]
+        if file.filename == "":
+            return jsonify({"error": "no file selected"}), 400
 
-    file = request.files["file"]
-    if file.filename == "":
-        return jsonify({"error": "no file selected"}), 400
+        if not allowed_file(file.filename):
+            return jsonify({"error": "file type not allowed"}), 400
 
-    if not allowed_file(file.filename):
-        return jsonify({"error": "file type not allowed"}), 400
+        # Check file size
+        file.seek(0, os.SEEK_END)
+        size = file.tell()
+        file.seek(0)
+        if size > MAX_FILE_SIZE:
+            return jsonify({"error": "file too large (max 10 MB)"}), 400
 
-    # Check file size
-    file.seek(0, os.SEEK_END)
-    size = file.tell()
-    file.seek(0)
-    if size > MAX_FILE_SIZE:
-        return jsonify({"error": "file too large (max 10 MB)"}), 400
+        folder = tenant_upload_folder()
+        os.makedirs(folder, exist_ok=True)
 
-    # Remove old attachment if exists
-    if todo.get("attachment"):
-        old_path = os.path.join(UPLOAD_FOLDER, todo["attachment"])
-        if os.path.exists(old_path):
-            os.remove(old_path)
+        # Remove old attachment if exists
+        if todo.get("attachment"):
+            old_path = os.path.join(folder, todo["attachment"])
+            if os.path.exists(old_path):
+                os.remove(old_path)
 
-    # Save with unique prefix to avoid collisions
-    original = secure_filename(file.filename)
-    unique_name = f"{uuid.uuid4().hex[:8]}_{original}"
-    file.save(os.path.join(UPLOAD_FOLDER, unique_name))
+        # Save with unique prefix to avoid collisions
+        original = secure_filename(file.filename)
+        unique_name = f"{uuid.uuid4().hex[:8]}_{original}"
+        file.save(os.path.join(folder, unique_name))
 
-    updated = manager.edit(todo_id, attachment=unique_name)
-    return jsonify(updated)
+        updated = manager.edit(todo_id, attachment=unique_name)
+        return jsonify(updated)
 
 
 @app.route("/uploads/<filename>")
 def serve_upload(filename):
+    # Kun filer i tenant'ens egen mappe kan hentes; secure_filename fjerner "/"
     safe = secure_filename(filename)
-    return send_from_directory(UPLOAD_FOLDER, safe)
+    return send_from_directory(tenant_upload_folder(), safe)
 
 
 @app.route("/api/todos/<int:todo_id>/attachment", methods=["DELETE"])
 def remove_attachment(todo_id):
-    todo = next((t for t in manager.todos if t["id"] == todo_id), None)
-    if todo is None:
-        return jsonify({"error": "not found"}), 404
+    with tenant_manager() as manager:
+        todo = next((t for t in manager.todos if t["id"] == todo_id), None)
+        if todo is None:
+            return jsonify({"error": "not found"}), 404
 
-    if todo.get("attachment"):
-        old_path = os.path.join(UPLOAD_FOLDER, todo["attachment"])
-        if os.path.exists(old_path):
-            os.remove(old_path)
+        if todo.get("attachment"):
+            old_path = os.path.join(tenant_upload_folder(), todo["attachment"])
+            if os.path.exists(old_path):
+                os.remove(old_path)
 
-    updated = manager.edit(todo_id, attachment="")
-    return jsonify(updated)
+        updated = manager.edit(todo_id, attachment="")
+        return jsonify(updated)
 
 
 # ── Todoist Sync ────────────────────────────────────────────────────────────
 
 
+def sync_available(tenant):
+    # config.py har én fælles Todoist-konto; andre tenants må ikke synkronisere
+    # mod den, ellers ser de hinandens todos.
+    return tenant == DEFAULT_TENANT
+
+
 @app.route("/api/sync", methods=["POST"])
 def trigger_sync():
-    global last_sync_time
-
-    if not syncer.is_configured():
+    tenant = current_tenant()
+    if not sync_available(tenant):
+        return jsonify({"error": "Todoist-sync er kun tilgængelig for standard-tenanten."}), 403
+    if not TodoistSync(None).is_configured():
         return jsonify({"error": "Todoist API token er ikke konfigureret i config.py."}), 400
 
     try:
-        result = syncer.full_sync()
-        last_sync_time = datetime.now().isoformat()
+        with tenants.checkout(tenant) as manager:
+            result = TodoistSync(manager).full_sync()
+        last_sync_times[tenant] = datetime.now().isoformat()
         return jsonify(result)
     except TodoistSyncError as e:
         return jsonify({"error": str(e)}), 502
@@ -171,9 +318,11 @@ def trigger_sync():
 
 @app.route("/api/sync/status")
 def sync_status():
+    tenant = current_tenant()
     return jsonify({
-        "configured": syncer.is_configured(),
-        "last_sync": last_sync_time,
+        "configured": TodoistSync(None).is_configured(),
+        "available": sync_available(tenant),
+        "last_sync": last_sync_times.get(tenant),
     })
 
 
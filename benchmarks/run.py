@@ -0,0 +1,347 @@
+"""Benchmarks for TodoManager, REST API'et og Todoist-sync.
+
+Kør fra repo-roden:
+
+    python -m benchmarks.run --sizes 1000,10000 --output bench.json
+    python -m benchmarks.run --sizes 1000,10000 --compare bench.json
+
+Resultatet er JSON med ops/sec, p50/p99 latency (ms) og peak memory (KiB)
+pr. benchmark, så to kørsler kan sammenlignes med --compare.
+"""
+
+import argparse
+import importlib
+import json
+import os
+import platform
+import random
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+import todo.todo as todo_module
+from todo import TodoManager
+
+SUITES = ("manager", "api", "sync")
+DEFAULT_SIZES = "1000,10000"
+DEFAULT_SYNC_SIZES = "100,1000"
+DEFAULT_SYNC_ITERATIONS = 5
+
+
+# ── Måling ───────────────────────────────────────────────────────────────────
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def measure(suite, name, size, op, iterations, memory_iterations=3):
+    """Kør op() iterations gange og returner et resultat-dict.
+
+    Peak memory måles i en separat kørsel med tracemalloc, så det ikke
+    påvirker tidsmålingerne.
+    """
+    latencies = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        op()
+        latencies.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    for _ in range(min(memory_iterations, iterations)):
+        op()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    total = sum(latencies)
+    return {
+        "suite": suite,
+        "name": name,
+        "size": size,
+        "iterations": iterations,
+        "ops_per_sec": round(iterations / total, 2) if total else None,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 4),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 4),
+        "peak_kib": round(peak / 1024, 1),
+    }
+
+
+def iterations_for(size, requested):
+    if requested:
+        return requested
+    # Mutationer gemmer hele store'et, så færre iterationer ved store størrelser
+    return max(5, min(200, 200_000 // size))
+
+
+def delete_iterations(n, available):
+    """Begræns n så measure() ikke sletter flere todos end der findes.
+
+    measure() kalder op n + min(memory_iterations, n) gange, og hver
+    sletning bruger sit eget id.
+    """
+    while n and n + min(3, n) > available:
+        n -= 1
+    return n
+
+
+# ── Data ─────────────────────────────────────────────────────────────────────
+
+
+def generate_todos(size, seed=42):
+    rng = random.Random(seed)
+    categories = ["", "Arbejde", "Privat", "Indkøb"]
+    priorities = ["Høj", "Medium", "Lav"]
+    for i in range(size):
+        yield {
+            "text": f"Todo {i} {rng.choice(['mælk', 'rapport', 'møde', 'kode', 'tandlæge'])}",
+            "done": rng.random() < 0.3,
+            "category": rng.choice(categories),
+            "priority": rng.choice(priorities),
+            "deadline": f"2026-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}" if rng.random() < 0.5 else "",
+        }
+
+
+class StoreFactory:
+    """Genererer hver store-størrelse én gang og kopierer den ind før hver suite."""
+
+    def __init__(self, workdir):
+        self.workdir = workdir
+        self.data_file = os.path.join(workdir, "todos.json")
+        self._templates = {}
+        todo_module.DATA_FILE = self.data_file
+
+    def fresh(self, size):
+        template = self._templates.get(size)
+        if template is None:
+            if os.path.exists(self.data_file):
+                os.remove(self.data_file)
+            TodoManager().add_many(generate_todos(size))
+            template = os.path.join(self.workdir, f"template_{size}.json")
+            shutil.copyfile(self.data_file, template)
+            self._templates[size] = template
+        shutil.copyfile(template, self.data_file)
+        return self.data_file
+
+
+# ── Suites ───────────────────────────────────────────────────────────────────
+
+
+def bench_manager(factory, size, iterations):
+    rng = random.Random(size)
+    results = []
+    n = iterations_for(size, iterations)
+
+    factory.fresh(size)
+    results.append(measure("manager", "load", size, TodoManager, n))
+
+    manager = TodoManager()
+    ids = [t["id"] for t in manager.todos]
+
+    results.append(measure("manager", "add", size, lambda: manager.add("Bench todo", priority="Høj"), n))
+    results.append(measure("manager", "edit", size, lambda: manager.edit(rng.choice(ids), new_text="Ændret"), n))
+    results.append(measure("manager", "toggle", size, lambda: manager.toggle_done(rng.choice(ids)), n))
+    # Som GET /api/todos: hele listen serialiseret til JSON
+    results.append(measure("manager", "list", size,
+                           lambda: json.dumps(manager.list(), ensure_ascii=False), n))
+    # Som "main.py list --active": streames fra disk og filtreres
+    results.append(measure("manager", "list_active", size,
+                           lambda: sum(1 for t in TodoManager(lazy=True).iter() if not t["done"]), n))
+
+    def search():
+        q = rng.choice(["mælk", "rapport", "møde", "findes-ikke"])
+        return [t for t in manager.list() if q in t["text"].lower()]
+
+    results.append(measure("manager", "search", size, search, n))
+
+    n = delete_iterations(n, len(ids))
+    if n:
+        delete_ids = rng.sample(ids, n + min(3, n))
+        results.append(measure("manager", "delete", size, lambda: manager.delete(delete_ids.pop()), n))
+    return results
+
+
+def bench_api(factory, size, iterations):
+    factory.fresh(size)
+    import app as app_module
+
+    # Default-tenanten bruger DATA_FILE; tøm cachen så det friske store indlæses
+    app_module.tenants.clear()
+    client = app_module.app.test_client()
+    rng = random.Random(size)
+    ids = [t["id"] for t in TodoManager(lazy=True).iter()]
+    n = iterations_for(size, iterations)
+    results = []
+
+    results.append(measure("api", "GET /api/todos", size, lambda: client.get("/api/todos"), n))
+    results.append(measure("api", "POST /api/todos", size,
+                           lambda: client.post("/api/todos", json={"text": "Bench", "priority": "Lav"}), n))
+    results.append(measure("api", "PUT /api/todos/<id>", size,
+                           lambda: client.put(f"/api/todos/{rng.choice(ids)}", json={"text": "Ændret"}), n))
+    results.append(measure("api", "PATCH /api/todos/<id>/toggle", size,
+                           lambda: client.patch(f"/api/todos/{rng.choice(ids)}/toggle"), n))
+    n = delete_iterations(n, len(ids))
+    if n:
+        delete_ids = rng.sample(ids, n + min(3, n))
+        results.append(measure("api", "DELETE /api/todos/<id>", size,
+                               lambda: client.delete(f"/api/todos/{delete_ids.pop()}"), n))
+    return results
+
+
+def _prepare_sync(factory, stub, size):
+    """Halvdelen af lokale todos er linket til Todoist, resten er nye lokalt.
+
+    Todoist har derudover size // 4 nye tasks der skal hentes.
+    """
+    stub.reset()
+    stub.seed(size // 2 + size // 4)
+    remote_ids = list(stub.tasks)
+    factory.fresh(size)
+    manager = TodoManager()
+    for todo, tid in zip(manager.todos, remote_ids[: size // 2]):
+        todo["todoist_id"] = tid
+    manager._save()
+    return manager
+
+
+def configure_todoist(workdir, base_url):
+    """Peg TodoistSync mod base_url via en config.py i workdir.
+
+    Returnerer todoist_sync-modulet genindlæst, så det ser den nye config.
+    """
+    with open(os.path.join(workdir, "config.py"), "w", encoding="utf-8") as f:
+        f.write(f'TODOIST_API_TOKEN = "bench"\nTODOIST_API_BASE = "{base_url}"\n')
+    if workdir not in sys.path:
+        sys.path.insert(0, workdir)
+
+    import todoist_sync
+    return importlib.reload(todoist_sync)
+
+
+def bench_sync(factory, size, latency, workdir, iterations):
+    from benchmarks.todoist_stub import StubTodoist
+
+    stub = StubTodoist(latency=latency).start()
+    todoist_sync = configure_todoist(workdir, stub.base_url)
+    n = iterations or DEFAULT_SYNC_ITERATIONS
+
+    try:
+        # full_sync muterer både lokalt og remote, så hver iteration får friske
+        # data; kun selve full_sync tages tid på
+        latencies = []
+        for _ in range(n):
+            manager = _prepare_sync(factory, stub, size)
+            syncer = todoist_sync.TodoistSync(manager)
+            start = time.perf_counter()
+            sync_result = syncer.full_sync()
+            latencies.append(time.perf_counter() - start)
+        requests_made = stub.request_count
+
+        manager = _prepare_sync(factory, stub, size)
+        syncer = todoist_sync.TodoistSync(manager)
+        tracemalloc.start()
+        syncer.full_sync()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    finally:
+        stub.stop()
+
+    total = sum(latencies)
+    return [{
+        "suite": "sync",
+        "name": "full_sync",
+        "size": size,
+        "iterations": n,
+        "latency_ms": latency * 1000,
+        "ops_per_sec": round(n / total, 4),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+        "peak_kib": round(peak / 1024, 1),
+        "requests": requests_made,
+        "errors": len(sync_result["errors"]),
+    }]
+
+
+# ── Rapport ──────────────────────────────────────────────────────────────────
+
+
+def compare(results, baseline):
+    """Print ændring i ops/sec og p99 i forhold til en tidligere kørsel."""
+    key = lambda r: (r["suite"], r["name"], r["size"])
+    old = {key(r): r for r in baseline["results"]}
+    print(f"{'benchmark':<45} {'size':>8} {'ops/sec':>12} {'Δ':>8} {'p99 ms':>10} {'Δ':>8}")
+    for r in results:
+        before = old.get(key(r))
+        if before is None:
+            continue
+        d_ops = (r["ops_per_sec"] / before["ops_per_sec"] - 1) * 100 if before["ops_per_sec"] else 0
+        d_p99 = (r["p99_ms"] / before["p99_ms"] - 1) * 100 if before["p99_ms"] else 0
+        print(f"{r['suite'] + ' ' + r['name']:<45} {r['size']:>8} {r['ops_per_sec']:>12} "
+              f"{d_ops:>+7.1f}% {r['p99_ms']:>10} {d_p99:>+7.1f}%")
+
+
+def parse_sizes(value):
+    return [int(s) for s in value.split(",") if s.strip()]
+
+
+def main(argv=None):
+    # config.py skrives om og genindlæses af TodoistSync; undgå forældede .pyc filer
+    sys.dont_write_bytecode = True
+    parser = argparse.ArgumentParser(description="Todo App benchmarks")
+    parser.add_argument("--suite", default=",".join(SUITES), help=f"kommasepareret: {', '.join(SUITES)}")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help="store-størrelser, fx 1000,10000,100000,1000000")
+    parser.add_argument("--sync-sizes", default=DEFAULT_SYNC_SIZES)
+    parser.add_argument("--iterations", type=int, default=0, help=f"standard: skaleres efter størrelse ({DEFAULT_SYNC_ITERATIONS} for sync)")
+    parser.add_argument("--latency", type=float, default=0.0, help="stub Todoist latency i sekunder")
+    parser.add_argument("--output", help="skriv JSON hertil i stedet for stdout")
+    parser.add_argument("--compare", help="tidligere JSON-resultat at sammenligne med")
+    args = parser.parse_args(argv)
+
+    suites = [s.strip() for s in args.suite.split(",") if s.strip()]
+    unknown = set(suites) - set(SUITES)
+    if unknown:
+        parser.error(f"ukendt suite: {', '.join(sorted(unknown))}")
+
+    workdir = tempfile.mkdtemp(prefix="todo-bench-")
+    factory = StoreFactory(workdir)
+    results = []
+    try:
+        for size in parse_sizes(args.sizes):
+            if "manager" in suites:
+                results += bench_manager(factory, size, args.iterations)
+            if "api" in suites:
+                results += bench_api(factory, size, args.iterations)
+        if "sync" in suites:
+            for size in parse_sizes(args.sync_sizes):
+                results += bench_sync(factory, size, args.latency, workdir, args.iterations)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "results": results,
+    }
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            compare(results, json.load(f))
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    elif not args.compare:
+        json.dump(report, sys.stdout, ensure_ascii=False, indent=2)
+        print()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,233 @@
+"""Load-test af full_sync mod den lokale Todoist-stub.
+
+Kør fra repo-roden:
+
+    python -m benchmarks.sync_load --tasks 10000 --local 10000
+    python -m benchmarks.sync_load --tasks 10000 --error-rate 0.01 --rate-limit-rate 0.01 --rounds 5
+
+Med standardindstillingerne (10k/10k) tager en runde omkring 1-2 minutter;
+tiden vokser mere end lineært med antal todos, da hver ændring skriver
+store-filen om. Fremdriften skrives til stderr undervejs (--progress).
+
+Scenariet: halvdelen af de lokale todos er linket til Todoist-tasks, en
+del af dem er lukket på Todoist siden sidste sync, og resten af stubbens
+tasks er nye. Efter hver full_sync tjekkes at lokal og remote er i sync, og
+der rapporteres wall time, antal requests pr. route og injicerede fejl.
+Med injicerede fejl køres op til --rounds runder, indtil de er i sync.
+full_sync pusher alle linkede tasks hver gang, så fejl på enkelte updates
+forekommer i hver runde og tælles for sig.
+"""
+
+import argparse
+import json
+import platform
+import random
+import shutil
+import signal
+import sys
+import tempfile
+import threading
+import time
+
+from benchmarks.run import StoreFactory, configure_todoist
+from benchmarks.todoist_stub import StubTodoist
+from todo import TodoManager
+
+MAX_PROBLEMS = 20
+PHASES = ("load_projects", "fetch_tasks", "close", "update", "pull", "push")
+
+
+def phase_seconds(todoist_sync):
+    """Samlet tid pr. fase i full_sync indtil nu, fra sync-metrics."""
+    return {phase: todoist_sync.SYNC_PHASE_SECONDS.sum(phase=phase) for phase in PHASES}
+
+
+class Progress:
+    """Skriv fremdrift til stderr mens en runde kører.
+
+    Faserne close og update måles i samme løkke og meldes derfor samtidig.
+    """
+
+    def __init__(self, todoist_sync, stub, interval):
+        self.todoist_sync = todoist_sync
+        self.stub = stub
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def __enter__(self):
+        if self.interval > 0:
+            self._start = time.perf_counter()
+            self._counts = self._phase_counts()
+            self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join()
+
+    def _phase_counts(self):
+        return {phase: self.todoist_sync.SYNC_PHASE_SECONDS.count(phase=phase) for phase in PHASES}
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            counts = self._phase_counts()
+            done = [phase for phase in PHASES if counts[phase] > self._counts[phase]]
+            current = next((phase for phase in PHASES if phase not in done), "færdig")
+            if current in ("close", "update"):
+                current = "close/update"
+            elapsed = time.perf_counter() - self._start
+            print(f"[{elapsed:7.1f}s] fase: {current:<13} requests: {self.stub.request_count}",
+                  file=sys.stderr, flush=True)
+
+
+def prepare(factory, stub, tasks, local, closed_share=0.05, random_seed=0):
+    """Byg scenariet og returner antal todos linket til Todoist."""
+    stub.reset()
+    stub.seed(tasks)
+    factory.fresh(local)
+    manager = TodoManager()
+
+    remote_ids = list(stub.tasks)
+    linked = min(local // 2, len(remote_ids))
+    for todo, tid in zip(manager.todos, remote_ids[:linked]):
+        todo["todoist_id"] = tid
+    manager._save()
+
+    # Tasks lukket på Todoist skal ende som done lokalt
+    rng = random.Random(random_seed)
+    for tid in rng.sample(remote_ids[:linked], int(linked * closed_share)):
+        stub.closed[tid] = stub.tasks.pop(tid)
+    return linked
+
+
+def check_consistency(todos, stub):
+    """Returner en liste af uoverensstemmelser mellem lokale todos og stubben.
+
+    Efter en fejlfri sync skal hver aktiv Todoist-task være linket til
+    præcis én aktiv lokal todo med samme tekst, og done todos må ikke
+    være linket.
+    """
+    problems = []
+    linked = {}
+    for todo in todos:
+        tid = todo.get("todoist_id", "")
+        if todo["done"]:
+            if tid:
+                problems.append(f"Todo #{todo['id']} er done men stadig linket til {tid}")
+            continue
+        if not tid:
+            problems.append(f"Todo #{todo['id']} er ikke pushet")
+        elif tid in linked:
+            problems.append(f"Task {tid} er linket til både #{linked[tid]} og #{todo['id']}")
+        elif tid not in stub.tasks:
+            problems.append(f"Todo #{todo['id']} peger på {tid}, som ikke er aktiv på Todoist")
+        else:
+            linked[tid] = todo["id"]
+            content = stub.tasks[tid]["content"].split(" 📎", 1)[0]
+            if content != todo["text"]:
+                problems.append(f"Todo #{todo['id']} har teksten {todo['text']!r}, Todoist {content!r}")
+    for tid in stub.tasks:
+        if tid not in linked:
+            problems.append(f"Task {tid} findes ikke lokalt")
+    return problems
+
+
+def run_rounds(todoist_sync, stub, rounds, progress=0):
+    results = []
+    for number in range(1, rounds + 1):
+        stub.reset_stats()
+        syncer = todoist_sync.TodoistSync(TodoManager())
+        phases_before = phase_seconds(todoist_sync)
+        start = time.perf_counter()
+        try:
+            with Progress(todoist_sync, stub, progress):
+                sync_result = syncer.full_sync()
+            errors = sync_result["errors"]
+            failed = None
+        except todoist_sync.TodoistSyncError as e:
+            # Fejl i load_projects eller fetch_tasks afbryder hele sync'en
+            sync_result = None
+            errors = []
+            failed = str(e)
+        elapsed = time.perf_counter() - start
+        phases = {phase: round(seconds - phases_before[phase], 3)
+                  for phase, seconds in phase_seconds(todoist_sync).items()}
+
+        problems = check_consistency(TodoManager().todos, stub)
+        results.append({
+            "round": number,
+            "wall_seconds": round(elapsed, 3),
+            "requests": stub.request_count,
+            "requests_per_sec": round(stub.request_count / elapsed, 1) if elapsed else None,
+            "phase_seconds": phases,
+            "routes": dict(stub.route_counts.most_common()),
+            "faults": {str(status): count for status, count in sorted(stub.faults.items())},
+            "result": {k: v for k, v in sync_result.items() if k != "errors"} if sync_result else None,
+            "failed": failed,
+            "errors": len(errors),
+            "sample_errors": errors[:5],
+            "problems": len(problems),
+            "sample_problems": problems[:MAX_PROBLEMS],
+        })
+        if sync_result and not problems:
+            break
+    return results
+
+
+def main(argv=None):
+    # config.py skrives og genindlæses af TodoistSync; undgå forældede .pyc filer
+    sys.dont_write_bytecode = True
+    parser = argparse.ArgumentParser(description="Load-test af Todoist full_sync mod en lokal stub")
+    parser.add_argument("--tasks", type=int, default=10_000, help="antal aktive tasks på Todoist")
+    parser.add_argument("--local", type=int, default=10_000, help="antal lokale todos")
+    parser.add_argument("--closed-share", type=float, default=0.05,
+                        help="andel af linkede tasks der er lukket på Todoist")
+    parser.add_argument("--latency", type=float, default=0.0, help="stub latency i sekunder pr. request")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="andel af requests der svarer 5xx")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="andel af requests der svarer 429")
+    parser.add_argument("--rounds", type=int, default=1, help="maks. antal sync-runder før der gives op")
+    parser.add_argument("--random-seed", type=int, default=0)
+    parser.add_argument("--progress", type=float, default=5.0,
+                        help="sekunder mellem fremdriftslinjer på stderr, 0 slår dem fra")
+    parser.add_argument("--output", help="skriv JSON hertil i stedet for stdout")
+    args = parser.parse_args(argv)
+
+    # SIGTERM (fx fra timeout) skal også rydde workdir op via finally
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(128 + signum))
+
+    workdir = tempfile.mkdtemp(prefix="todo-sync-load-")
+    stub = StubTodoist(latency=args.latency, error_rate=args.error_rate,
+                       rate_limit_rate=args.rate_limit_rate, random_seed=args.random_seed).start()
+    try:
+        factory = StoreFactory(workdir)
+        todoist_sync = configure_todoist(workdir, stub.base_url)
+        linked = prepare(factory, stub, args.tasks, args.local, args.closed_share, args.random_seed)
+        rounds = run_rounds(todoist_sync, stub, args.rounds, args.progress)
+    finally:
+        stub.stop()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    last = rounds[-1]
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "config": {k: v for k, v in vars(args).items() if k != "output"},
+        "linked": linked,
+        "converged": last["result"] is not None and not last["problems"],
+        "rounds": rounds,
+    }
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    else:
+        json.dump(report, sys.stdout, ensure_ascii=False, indent=2)
+        print()
+    return 0 if report["converged"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,254 @@
+"""Minimal lokal stand-in for Todoist REST API'et til benchmarks og tests.
+
+Implementerer kun de routes TodoistSync bruger og holder alt i hukommelsen.
+Startes i en baggrundstråd med StubTodoist(latency=0.01).start(), eller
+som selvstændig server:
+
+    python -m benchmarks.todoist_stub --port 8765 --tasks 10000 --error-rate 0.01
+
+error_rate og rate_limit_rate er sandsynligheden for at en request svarer
+5xx eller 429 (med Retry-After) i stedet for at blive udført. Fejlene og de
+seedede data trækkes fra random_seed, så en kørsel kan gentages.
+"""
+
+import argparse
+import json
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+_TASK_RE = re.compile(r"^/tasks/([^/]+)(/close|/reopen)?$")
+SERVER_ERRORS = (500, 502, 503)
+
+
+def route_name(method, path):
+    """Normaliser en request til fx "POST /tasks/<id>/close"."""
+    match = _TASK_RE.match(path)
+    if match:
+        path = "/tasks/<id>" + (match.group(2) or "")
+    return f"{method} {path}"
+
+
+class StubTodoist:
+    def __init__(self, latency=0.0, error_rate=0.0, rate_limit_rate=0.0, retry_after=1,
+                 random_seed=0, host="127.0.0.1", port=0):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.retry_after = retry_after
+        self.random_seed = random_seed
+        self.projects = {}  # id -> project
+        self.tasks = {}  # id -> task (kun aktive)
+        self.closed = {}  # id -> task
+        self.request_count = 0
+        self.route_counts = Counter()  # "METHOD /route" -> antal requests
+        self.faults = Counter()  # statuskode -> antal injicerede fejl
+        self._rng = random.Random(random_seed)
+        self._next_id = 1
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), _make_handler(self))
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def new_id(self):
+        with self._lock:
+            value = str(self._next_id)
+            self._next_id += 1
+            return value
+
+    def reset(self):
+        with self._lock:
+            self.projects.clear()
+            self.tasks.clear()
+            self.closed.clear()
+            self._rng = random.Random(self.random_seed)
+        self.reset_stats()
+
+    def reset_stats(self):
+        with self._lock:
+            self.request_count = 0
+            self.route_counts.clear()
+            self.faults.clear()
+
+    def seed(self, task_count, project_names=("Inbox", "Arbejde", "Privat", "Indkøb")):
+        """Fyld serveren med projekter og task_count aktive tasks."""
+        rng = random.Random(self.random_seed)
+        project_ids = []
+        for name in project_names:
+            pid = self.new_id()
+            self.projects[pid] = {"id": pid, "name": name}
+            project_ids.append(pid)
+        for i in range(task_count):
+            tid = self.new_id()
+            due = None
+            if rng.random() < 0.3:
+                date = f"2026-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"
+                due = {"date": date, "string": date, "is_recurring": False}
+            self.tasks[tid] = {
+                "id": tid,
+                "content": f"Remote task {i}",
+                "priority": rng.randint(1, 4),
+                "project_id": rng.choice(project_ids),
+                "due": due,
+            }
+
+    # ── Route handling ───────────────────────────────────────────────────────
+
+    def handle(self, method, path, body):
+        """Returner (status, payload) for en request."""
+        with self._lock:
+            self.request_count += 1
+            self.route_counts[route_name(method, path)] += 1
+            roll = self._rng.random()
+            status = None
+            if roll < self.rate_limit_rate:
+                status = 429
+            elif roll < self.rate_limit_rate + self.error_rate:
+                status = self._rng.choice(SERVER_ERRORS)
+            if status is not None:
+                self.faults[status] += 1
+        if self.latency:
+            time.sleep(self.latency)
+        # Fejl injiceres før requesten udføres, så en retry aldrig laver dubletter
+        if status is not None:
+            return status, {"error": "injected failure"}
+
+        if path == "/projects":
+            if method == "GET":
+                return 200, list(self.projects.values())
+            if method == "POST":
+                pid = self.new_id()
+                project = {"id": pid, "name": body.get("name", "")}
+                self.projects[pid] = project
+                return 200, project
+        if path == "/tasks":
+            if method == "GET":
+                return 200, list(self.tasks.values())
+            if method == "POST":
+                tid = self.new_id()
+                task = {"id": tid, "due": None}
+                self._apply(task, body)
+                self.tasks[tid] = task
+                return 200, task
+
+        match = _TASK_RE.match(path)
+        if match:
+            tid, action = match.groups()
+            if action == "/close" and method == "POST":
+                task = self.tasks.pop(tid, None)
+                if task is None:
+                    return 404, {"error": "not found"}
+                self.closed[tid] = task
+                return 204, None
+            if action == "/reopen" and method == "POST":
+                task = self.closed.pop(tid, None)
+                if task is None:
+                    return 404, {"error": "not found"}
+                self.tasks[tid] = task
+                return 204, None
+            if action is None:
+                task = self.tasks.get(tid)
+                if task is None:
+                    return 404, {"error": "not found"}
+                if method == "GET":
+                    return 200, task
+                if method == "POST":
+                    self._apply(task, body)
+                    return 200, task
+                if method == "DELETE":
+                    del self.tasks[tid]
+                    return 204, None
+        return 404, {"error": "not found"}
+
+    @staticmethod
+    def _apply(task, body):
+        for key in ("content", "priority", "project_id"):
+            if key in body:
+                task[key] = body[key]
+        if body.get("due_date"):
+            task["due"] = {"date": body["due_date"], "string": body["due_date"], "is_recurring": False}
+        elif body.get("due_string") == "no date":
+            task["due"] = None
+
+
+def _make_handler(stub):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def _dispatch(self, method):
+            length = int(self.headers.get("Content-Length") or 0)
+            raw = self.rfile.read(length) if length else b""
+            body = json.loads(raw) if raw else {}
+            path = self.path.split("?", 1)[0]
+            status, payload = stub.handle(method, path, body)
+            data = b"" if payload is None else json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            if status == 429:
+                self.send_header("Retry-After", str(stub.retry_after))
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self):
+            self._dispatch("GET")
+
+        def do_POST(self):
+            self._dispatch("POST")
+
+        def do_DELETE(self):
+            self._dispatch("DELETE")
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Lokal stand-in for Todoist REST API'et")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--tasks", type=int, default=0, help="antal seedede aktive tasks")
+    parser.add_argument("--latency", type=float, default=0.0, help="sekunder pr. request")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="andel af requests der svarer 5xx")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="andel af requests der svarer 429")
+    parser.add_argument("--retry-after", type=int, default=1)
+    parser.add_argument("--random-seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    stub = StubTodoist(latency=args.latency, error_rate=args.error_rate,
+                       rate_limit_rate=args.rate_limit_rate, retry_after=args.retry_after,
+                       random_seed=args.random_seed, host=args.host, port=args.port)
+    stub.seed(args.tasks)
+    print(f"Todoist stub kører på {stub.base_url} med {len(stub.tasks)} tasks")
+    print(f'Sæt TODOIST_API_BASE = "{stub.base_url}" i config.py. Stop med Ctrl+C.')
+    try:
+        stub._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stub._server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,8 @@
 import sys
 import os
+import json
+import argparse
+from itertools import islice
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "src"))
 
@@ -15,7 +18,271 @@ def print_todos(todos):
         print(f"  [{status}] {t['id']}. {t['text']}")
 
 
-def main():
+def _emit(args, data, text):
+    if args.json:
+        print(json.dumps(data, ensure_ascii=False))
+    else:
+        print(text)
+
+
+def _not_found(args, todo_id):
+    _emit(args, {"error": "not found", "id": todo_id}, "Todo ikke fundet.")
+    return 1
+
+
+def _non_negative_int(value):
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"ikke et tal: {value}")
+    if number < 0:
+        raise argparse.ArgumentTypeError(f"skal være 0 eller større: {value}")
+    return number
+
+
+def _matches(todo, args, today):
+    if args.done and not todo["done"]:
+        return False
+    if args.active and todo["done"]:
+        return False
+    if args.overdue and (todo["done"] or not todo["deadline"] or todo["deadline"] >= today):
+        return False
+    if args.category and todo["category"] != args.category:
+        return False
+    if args.priority and todo["priority"] != args.priority:
+        return False
+    if args.search and args.search.lower() not in todo["text"].lower():
+        return False
+    return True
+
+
+def run_list(args):
+    from datetime import date
+    from todo.importer import normalize_category, normalize_priority, ImportFormatError
+
+    # Filtrene normaliseres som ved add, så "--priority høj" finder "Høj"
+    try:
+        if args.category:
+            args.category = normalize_category(args.category, strict=True)
+        if args.priority:
+            args.priority = normalize_priority(args.priority)
+    except ImportFormatError as e:
+        _emit(args, {"error": str(e)}, f"Ugyldigt filter: {e}")
+        return 1
+
+    today = date.today().isoformat()
+    manager = TodoManager(lazy=True)
+    todos = (t for t in manager.iter() if _matches(t, args, today))
+    if args.limit:
+        todos = islice(todos, args.limit)
+
+    count = 0
+    if args.json:
+        # Streames som et JSON-array, så store'et ikke skal ligge i hukommelsen
+        sys.stdout.write("[")
+        for todo in todos:
+            sys.stdout.write(("," if count else "") + "\n" + json.dumps(todo, ensure_ascii=False))
+            count += 1
+        sys.stdout.write("\n]\n" if count else "]\n")
+        return 0
+
+    for todo in todos:
+        status = "x" if todo["done"] else " "
+        extra = "".join(f"  [{todo[key]}]" for key in ("category", "deadline") if todo[key])
+        print(f"  [{status}] {todo['id']}. {todo['text']}{extra}")
+        count += 1
+    if not count:
+        print("Ingen todos endnu.")
+    return 0
+
+
+def run_add(args):
+    from todo.importer import normalize_row, ImportFormatError
+
+    try:
+        row = normalize_row({"text": args.text, "category": args.category,
+                             "priority": args.priority, "deadline": args.deadline}, strict=True)
+    except ImportFormatError as e:
+        _emit(args, {"error": str(e)}, f"Ugyldig todo: {e}")
+        return 1
+    todo = TodoManager(lazy=True).add(row["text"], category=row["category"],
+                                      priority=row["priority"], deadline=row["deadline"])
+    _emit(args, todo, f"Tilføjet: {todo['id']}. {todo['text']}")
+    return 0
+
+
+def run_done(args):
+    todo = TodoManager(lazy=True).complete(args.id)
+    if todo is None:
+        return _not_found(args, args.id)
+    _emit(args, todo, f"Færdiggjort: {todo['text']}")
+    return 0
+
+
+def run_edit(args):
+    from todo.importer import normalize_category, normalize_priority, normalize_deadline, ImportFormatError
+
+    try:
+        fields = {
+            "new_text": args.text.strip() if args.text is not None else None,
+            "category": normalize_category(args.category, strict=True) if args.category is not None else None,
+            "priority": normalize_priority(args.priority) if args.priority is not None else None,
+            "deadline": normalize_deadline(args.deadline, strict=True) if args.deadline is not None else None,
+        }
+    except ImportFormatError as e:
+        _emit(args, {"error": str(e)}, f"Ugyldig ændring: {e}")
+        return 1
+    if fields["new_text"] == "":
+        _emit(args, {"error": "text mangler"}, "Tom beskrivelse - todo ikke ændret.")
+        return 1
+    todo = TodoManager(lazy=True).edit(args.id, **fields)
+    if todo is None:
+        return _not_found(args, args.id)
+    _emit(args, todo, f"Opdateret: {todo['id']}. {todo['text']}")
+    return 0
+
+
+def run_rm(args):
+    todo = TodoManager(lazy=True).delete(args.id)
+    if todo is None:
+        return _not_found(args, args.id)
+    _emit(args, todo, f"Slettet: {todo['text']}")
+    return 0
+
+
+def run_sync(args):
+    # requests og todoist_sync indlæses kun når der faktisk synkroniseres
+    from todoist_sync import TodoistSync, TodoistSyncError
+    import requests
+
+    syncer = TodoistSync(TodoManager())
+    if not syncer.is_configured():
+        _emit(args, {"error": "not configured"}, "Todoist API token er ikke konfigureret i config.py.")
+        return 1
+    try:
+        result = syncer.full_sync()
+    except TodoistSyncError as e:
+        _emit(args, {"error": str(e)}, f"Sync fejlede: {e}")
+        return 1
+    except requests.ConnectionError:
+        _emit(args, {"error": "connection"}, "Kunne ikke forbinde til Todoist. Tjek din internetforbindelse.")
+        return 1
+    text = (f"Sync: {result['pulled']} hentet, {result['pushed']} sendt, "
+            f"{result['updated']} opdateret, {result['completed']} afsluttet")
+    text += "".join(f"\n  {error}" for error in result["errors"])
+    _emit(args, result, text)
+    return 0 if result["success"] else 1
+
+
+def run_import(args):
+    from todo.importer import import_todos, detect_format, ImportFormatError
+
+    # add_many tilføjer i slutningen af filen, så store'et behøver ikke indlæses
+    manager = TodoManager(lazy=True)
+    try:
+        fmt = args.format or detect_format(args.file)
+        with open(args.file, "r", encoding="utf-8-sig", newline="") as f:
+            result = import_todos(manager, f, fmt=fmt, batch_size=args.batch_size)
+    except (OSError, ImportFormatError) as e:
+        _emit(args, {"error": str(e)}, f"Import fejlede: {e}")
+        return 1
+
+    text = f"Importeret: {result['imported']}, sprunget over: {result['skipped']}"
+    text += "".join(f"\n  {error}" for error in result["errors"])
+    _emit(args, result, text)
+    return 0 if result["success"] else 1
+
+
+def run_export(args):
+    from todo.exporter import export_todos
+    from todo.importer import detect_format, ImportFormatError
+
+    manager = TodoManager(lazy=True)
+    if args.file in (None, "-"):
+        export_todos(manager.iter(), sys.stdout, fmt=args.format or "ndjson")
+        return 0
+    try:
+        fmt = args.format or detect_format(args.file)
+    except ImportFormatError as e:
+        _emit(args, {"error": str(e)}, f"Eksport fejlede: {e}")
+        return 1
+    with open(args.file, "w", encoding="utf-8", newline="") as f:
+        count = export_todos(manager.iter(), f, fmt=fmt)
+    _emit(args, {"exported": count, "file": args.file, "format": fmt},
+          f"Eksporteret: {count} todos til {args.file}")
+    return 0
+
+
+def build_parser():
+    from todo.importer import FORMATS, DEFAULT_BATCH_SIZE
+
+    # --json deles af alle subkommandoer via en parent-parser
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--json", action="store_true", help="maskinlæsbart output")
+
+    parser = argparse.ArgumentParser(description="Todo App. Uden kommando startes den interaktive menu.")
+    sub = parser.add_subparsers(dest="command")
+
+    p_list = sub.add_parser("list", parents=[common], help="Vis todos")
+    state = p_list.add_mutually_exclusive_group()
+    state.add_argument("--done", action="store_true", help="kun færdige")
+    state.add_argument("--active", action="store_true", help="kun aktive")
+    state.add_argument("--overdue", action="store_true", help="kun overskredne")
+    p_list.add_argument("--category")
+    p_list.add_argument("--priority")
+    p_list.add_argument("--search")
+    p_list.add_argument("--limit", type=_non_negative_int, default=0, help="0 = ingen grænse")
+    p_list.set_defaults(func=run_list)
+
+    p_add = sub.add_parser("add", parents=[common], help="Tilføj todo")
+    p_add.add_argument("text")
+    p_add.add_argument("--category", default="")
+    p_add.add_argument("--priority", default="Medium")
+    p_add.add_argument("--deadline", default="", help="YYYY-MM-DD")
+    p_add.set_defaults(func=run_add)
+
+    p_done = sub.add_parser("done", parents=[common], help="Færdiggør todo")
+    p_done.add_argument("id", type=int)
+    p_done.set_defaults(func=run_done)
+
+    p_edit = sub.add_parser("edit", parents=[common], help="Rediger todo")
+    p_edit.add_argument("id", type=int)
+    p_edit.add_argument("--text")
+    p_edit.add_argument("--category")
+    p_edit.add_argument("--priority")
+    p_edit.add_argument("--deadline", help="YYYY-MM-DD, tom streng fjerner deadline")
+    p_edit.set_defaults(func=run_edit)
+
+    p_rm = sub.add_parser("rm", parents=[common], help="Slet todo")
+    p_rm.add_argument("id", type=int)
+    p_rm.set_defaults(func=run_rm)
+
+    p_sync = sub.add_parser("sync", parents=[common], help="Synkroniser med Todoist")
+    p_sync.set_defaults(func=run_sync)
+
+    p_import = sub.add_parser("import", parents=[common], help="Importer todos fra CSV/NDJSON/Todoist-backup")
+    p_import.add_argument("file")
+    p_import.add_argument("--format", choices=FORMATS, help="standard: gæt ud fra filnavnet")
+    p_import.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    p_import.set_defaults(func=run_import)
+
+    p_export = sub.add_parser("export", parents=[common], help="Eksporter todos til CSV/NDJSON")
+    p_export.add_argument("file", nargs="?", help="standard: NDJSON til stdout (uden resumé, også med --json)")
+    p_export.add_argument("--format", choices=FORMATS, help="standard: gæt ud fra filnavnet")
+    p_export.set_defaults(func=run_export)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.command:
+        return args.func(args)
+    interactive()
+    return 0
+
+
+def interactive():
     manager = TodoManager()
 
     while True:
@@ -85,4 +352,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -0,0 +1,25 @@
+"""Eksport af todos til CSV eller NDJSON i samme felter som importen læser."""
+
+import csv
+import json
+
+FIELDS = ("id", "text", "done", "category", "priority", "deadline", "attachment", "todoist_id")
+
+
+def export_todos(todos, stream, fmt="csv"):
+    """Skriv todos (en vilkårlig iterable) til en tekst-stream. Returnerer antal."""
+    count = 0
+    if fmt == "ndjson":
+        for todo in todos:
+            stream.write(json.dumps({key: todo.get(key, "") for key in FIELDS}, ensure_ascii=False))
+            stream.write("\n")
+            count += 1
+    elif fmt == "csv":
+        writer = csv.DictWriter(stream, fieldnames=FIELDS, extrasaction="ignore", lineterminator="\n")
+        writer.writeheader()
+        for todo in todos:
+            writer.writerow(dict(todo, done="true" if todo.get("done") else "false"))
+            count += 1
+    else:
+        raise ValueError(f"Ukendt format: {fmt}")
+    return count
@@ -0,0 +1,218 @@
+"""Bulk-import af todos fra CSV, NDJSON og Todoist CSV-backups.
+
+Filen læses række for række, så hukommelsesforbruget til parsing er
+begrænset af batch-størrelsen. Hver batch gemmes med én id-allokering og
+én skrivning via TodoManager.add_many().
+"""
+
+import csv
+import json
+from datetime import date, datetime
+from itertools import islice
+
+from . import mappings
+
+FORMATS = ("csv", "ndjson")
+DEFAULT_BATCH_SIZE = 100_000
+MAX_REPORTED_ERRORS = 100
+
+_PRIORITY_BY_NAME = {p.lower(): p for p in mappings.LOCAL_PRIORITIES}
+
+
+class ImportFormatError(ValueError):
+    """Raised when an import file or a row in it cannot be parsed."""
+    pass
+
+
+def detect_format(filename):
+    """Gæt formatet ud fra filnavnet; CSV er standard.
+
+    .json afvises: det er typisk et JSON-array (fx todos.json), ikke NDJSON.
+    """
+    name = (filename or "").lower()
+    if name.endswith((".ndjson", ".jsonl")):
+        return "ndjson"
+    if name.endswith(".json"):
+        raise ImportFormatError("JSON-arrays understøttes ikke; brug NDJSON (.ndjson/.jsonl) eller CSV.")
+    return "csv"
+
+
+# ── Parsing ──────────────────────────────────────────────────────────────────
+
+
+def _iter_csv(stream):
+    reader = csv.DictReader(stream)
+    fields = reader.fieldnames or []
+    # Todoist CSV-backups har store bogstaver: TYPE, CONTENT, PRIORITY, DATE, ...
+    if "CONTENT" in fields and "TYPE" in fields:
+        for line_no, row in enumerate(reader, start=2):
+            if (row.get("TYPE") or "").strip().lower() != "task":
+                continue
+            yield line_no, _from_todoist_backup(row)
+        return
+    if "text" not in fields:
+        raise ImportFormatError("CSV mangler en 'text' kolonne.")
+    for line_no, row in enumerate(reader, start=2):
+        yield line_no, row
+
+
+def _iter_ndjson(stream):
+    first = True
+    for line_no, line in enumerate(stream, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        # Et JSON-array afvises før første batch gemmes, ikke som fejl pr. linje
+        if first and line.startswith("["):
+            raise ImportFormatError("Filen er et JSON-array, ikke NDJSON (ét objekt pr. linje).")
+        first = False
+        try:
+            row = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield line_no, ImportFormatError(f"ugyldig JSON: {e.msg}")
+            continue
+        if not isinstance(row, dict):
+            yield line_no, ImportFormatError("forventede et JSON-objekt")
+            continue
+        yield line_no, row
+
+
+def _from_todoist_backup(row):
+    # I backup-formatet er PRIORITY 1 højest (p1), modsat REST API'et hvor 4 er højest
+    priority = ""
+    raw = (row.get("PRIORITY") or "").strip()
+    if raw.isdigit() and 1 <= int(raw) <= 4:
+        priority = 5 - int(raw)
+    # DATE kan være fritekst som "every monday" og PROJECT et vilkårligt
+    # Todoist-projekt; de normaliseres lempeligt her, resten valideres strengt
+    return {
+        "text": row.get("CONTENT", ""),
+        "priority": priority,
+        "deadline": normalize_deadline(row.get("DATE")),
+        "category": normalize_category(row.get("PROJECT")),
+    }
+
+
+def iter_rows(stream, fmt="csv"):
+    """Yield (line_no, row) for each row; row is an ImportFormatError on parse errors."""
+    if fmt == "csv":
+        return _iter_csv(stream)
+    if fmt == "ndjson":
+        return _iter_ndjson(stream)
+    raise ImportFormatError(f"Ukendt format: {fmt}")
+
+
+# ── Normalisering ────────────────────────────────────────────────────────────
+
+
+def normalize_priority(value):
+    if value is None or value == "":
+        return "Medium"
+    if isinstance(value, int) or (isinstance(value, str) and value.strip().isdigit()):
+        number = int(value)
+        if 1 <= number <= 4:
+            return mappings.api_to_local_priority(number)
+        raise ImportFormatError(f"ugyldig prioritet: {value}")
+    local = _PRIORITY_BY_NAME.get(str(value).strip().lower())
+    if local:
+        return local
+    raise ImportFormatError(f"ugyldig prioritet: {value}")
+
+
+def normalize_category(value, strict=False):
+    """Map til en lokal kategori; ukendte værdier bliver "" medmindre strict."""
+    value = str(value or "").strip()
+    category = mappings.project_name_to_category(value)
+    if strict and value and not category:
+        raise ImportFormatError(f"ukendt kategori: {value}")
+    return category
+
+
+def normalize_deadline(value, strict=False):
+    """Returner datoen som YYYY-MM-DD.
+
+    Uden strict ignoreres værdier der ikke er en dato. Med strict (CLI-input
+    og import) skal værdien være en gyldig ISO-dato eller -datetime.
+    """
+    value = str(value or "").strip()
+    if not value:
+        return ""
+    if strict:
+        try:
+            if len(value) > 10:
+                return datetime.fromisoformat(value).date().isoformat()
+            return date.fromisoformat(value).isoformat()
+        except ValueError:
+            raise ImportFormatError(f"ugyldig deadline: {value} (brug YYYY-MM-DD)")
+    # Accepter også datetimes, men gem kun datoen ligesom Todoist-sync
+    try:
+        return date.fromisoformat(value[:10]).isoformat()
+    except ValueError:
+        # Todoist-backups kan have fritekst som "every monday" - den ignoreres
+        return ""
+
+
+def normalize_row(row, strict=False):
+    """Valider og normaliser en række til felterne TodoManager.add() forventer.
+
+    strict afviser ukendte kategorier og deadlines i stedet for at tømme dem.
+    """
+    text = str(row.get("text") or "").strip()
+    if not text:
+        raise ImportFormatError("text mangler")
+    done = row.get("done", False)
+    if isinstance(done, str):
+        done = done.strip().lower() in ("1", "true", "yes", "ja", "x")
+    return {
+        "text": text,
+        "done": bool(done),
+        "category": normalize_category(row.get("category"), strict),
+        "priority": normalize_priority(row.get("priority")),
+        "deadline": normalize_deadline(row.get("deadline"), strict),
+    }
+
+
+# ── Ingestion ────────────────────────────────────────────────────────────────
+
+
+def import_todos(manager, stream, fmt="csv", batch_size=DEFAULT_BATCH_SIZE):
+    """Importer todos fra en tekst-stream i batches.
+
+    Returnerer et resultat i samme stil som TodoistSync.full_sync().
+    """
+    if batch_size < 1:
+        raise ImportFormatError("batch_size skal være mindst 1.")
+
+    result = {
+        "success": True,
+        "imported": 0,
+        "skipped": 0,
+        "errors": [],
+    }
+
+    def valid_rows():
+        for line_no, row in iter_rows(stream, fmt):
+            try:
+                if isinstance(row, ImportFormatError):
+                    raise row
+                yield normalize_row(row, strict=True)
+            except ImportFormatError as e:
+                result["skipped"] += 1
+                if len(result["errors"]) < MAX_REPORTED_ERRORS:
+                    result["errors"].append(f"Linje {line_no}: {e}")
+
+    rows = valid_rows()
+    try:
+        while True:
+            batch = list(islice(rows, batch_size))
+            if not batch:
+                break
+            result["imported"] += manager.add_many(batch)
+    except (csv.Error, UnicodeDecodeError) as e:
+        # Allerede gemte batches bliver liggende; resten af filen kan ikke læses
+        raise ImportFormatError(f"Filen kunne ikke læses efter {result['imported']} todos: {e}") from e
+
+    if result["skipped"]:
+        result["success"] = False
+
+    return result
@@ -0,0 +1,51 @@
+"""Fælles mapping mellem lokale felter og Todoist-værdier.
+
+Bruges både af TodoistSync og af bulk-import, så begge normaliserer
+kategori og prioritet ens.
+"""
+
+# Mapping mellem Todoist projekt-navne og lokale kategorier
+PROJECT_TO_CATEGORY = {
+    "work": "Arbejde",
+    "arbejde": "Arbejde",
+    "personal": "Privat",
+    "privat": "Privat",
+    "shopping": "Indkøb",
+    "indkøb": "Indkøb",
+    "groceries": "Indkøb",
+}
+
+CATEGORY_TO_PROJECT = {
+    "Arbejde": "Arbejde",
+    "Privat": "Privat",
+    "Indkøb": "Indkøb",
+}
+
+LOCAL_PRIORITIES = ("Høj", "Medium", "Lav")
+
+
+def local_to_api_priority(priority):
+    mapping = {"Høj": 4, "Medium": 2, "Lav": 1}
+    return mapping.get(priority, 1)
+
+
+def api_to_local_priority(api_priority):
+    mapping = {4: "Høj", 3: "Høj", 2: "Medium", 1: "Lav"}
+    return mapping.get(api_priority, "Medium")
+
+
+def project_name_to_category(name):
+    """Map et Todoist projekt-navn til en lokal kategori ("" hvis ingen)."""
+    if not name:
+        return ""
+    # Ignorer Inbox - det er Todoist's default og matcher ikke en lokal kategori
+    if name.lower() == "inbox":
+        return ""
+    # Tjek om projektet mapper til en lokal kategori
+    mapped = PROJECT_TO_CATEGORY.get(name.lower())
+    if mapped:
+        return mapped
+    # Ellers brug projekt-navnet direkte hvis det matcher en kategori
+    if name in CATEGORY_TO_PROJECT:
+        return name
+    return ""
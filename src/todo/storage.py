@@ -0,0 +1,174 @@
+"""Streaming adgang til store-filen uden at indlæse det hele.
+
+TodoManager._save() skriver én todo pr. linje:
+
+    [
+    {"id": 1, ...},
+    {"id": 2, ...}
+    ]
+
+Det gør det muligt at tilføje en todo ved kun at skrive i slutningen af
+filen, og at ændre én todo ved at kopiere de øvrige linjer uændret uden at
+parse eller serialisere dem. Filer i det gamle format (json.dump med
+indent=2) genkendes ikke af is_line_format() og indlæses som før.
+"""
+
+import json
+import os
+import shutil
+import tempfile
+
+_TAIL = b"\n]\n"
+_ID_PREFIX = '{"id": '
+_encode = json.JSONEncoder(ensure_ascii=False).encode
+
+
+def is_line_format(path):
+    """True hvis filen findes og er skrevet med én todo pr. linje."""
+    try:
+        with open(path, "rb") as f:
+            head = f.read(64)
+    except FileNotFoundError:
+        return False
+    if head.startswith(b"[]"):
+        return True
+    return head.startswith(b"[\n{")
+
+
+def _line_id(line):
+    if line.startswith(_ID_PREFIX):
+        end = line.find(",", len(_ID_PREFIX))
+        if end != -1:
+            try:
+                return int(line[len(_ID_PREFIX):end])
+            except ValueError:
+                pass
+    return json.loads(line.rstrip().rstrip(","))["id"]
+
+
+def iter_todos(path):
+    """Yield todos én ad gangen; virker for begge filformater."""
+    if not os.path.exists(path):
+        return
+    if not is_line_format(path):
+        with open(path, "r", encoding="utf-8") as f:
+            yield from json.load(f)
+        return
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.rstrip()
+            if line.startswith("{"):
+                yield json.loads(line.rstrip(","))
+
+
+def last_todo(path, chunk_size=65536):
+    """Returner den sidste todo i filen ved kun at læse slutningen af den."""
+    with open(path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        size = f.tell()
+        read = min(size, chunk_size)
+        while True:
+            f.seek(size - read)
+            data = f.read(read)
+            lines = data.rstrip().split(b"\n")
+            # Første linje kan være skåret over, medmindre vi har læst hele filen
+            complete = lines if read == size else lines[1:]
+            for line in reversed(complete):
+                if line.startswith(b"{"):
+                    return json.loads(line.decode("utf-8").rstrip(","))
+            if read == size:
+                return None
+            read = min(size, read * 2)
+
+
+def append(path, todo):
+    """Tilføj en todo i slutningen af filen. Returnerer antal skrevne bytes."""
+    return append_many(path, [todo])
+
+
+def append_many(path, todos):
+    """Tilføj todos i slutningen af filen uden at røre de eksisterende linjer.
+
+    Filen oprettes hvis den ikke findes. Returnerer antal skrevne bytes.
+    """
+    lines = ",\n".join(map(_encode, todos)).encode("utf-8")
+    if not os.path.exists(path):
+        data = b"[\n" + lines + _TAIL
+        with open(path, "wb") as f:
+            f.write(data)
+        return len(data)
+    with open(path, "r+b") as f:
+        f.seek(0, os.SEEK_END)
+        size = f.tell()
+        if size <= len(b"[]\n"):
+            f.seek(0)
+            data = b"[\n" + lines + _TAIL
+        else:
+            f.seek(size - len(_TAIL))
+            if f.read() != _TAIL:
+                raise ValueError(f"{path} slutter ikke som forventet")
+            f.seek(size - len(_TAIL))
+            data = b",\n" + lines + _TAIL
+        f.write(data)
+        f.truncate()
+    return len(data)
+
+
+def update(path, todo_id, change):
+    """Anvend change(todo) på todo'en med todo_id og skriv filen om.
+
+    change returnerer den nye todo, eller None for at slette den. Kun den
+    berørte linje parses; resten kopieres uændret. Returnerer den oprindelige
+    (ved sletning) eller opdaterede todo, eller None hvis id'et ikke findes.
+    """
+    target = b'{"id": %d,' % todo_id
+    prefix = _ID_PREFIX.encode("utf-8")
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".todos-", suffix=".tmp")
+    found = None
+    try:
+        with open(path, "rb") as src, os.fdopen(fd, "wb") as dst:
+            prev = None  # sidste todo-linje skrevet til dst
+            for line in src:
+                # Linjer før den berørte kopieres byte for byte uden at blive parset
+                if not line.startswith(target):
+                    if line.startswith(prefix) or not line.startswith(b"{"):
+                        dst.write(line)
+                        if line.startswith(b"{"):
+                            prev = line
+                        continue
+                    if _line_id(line.decode("utf-8")) != todo_id:
+                        dst.write(line)
+                        prev = line
+                        continue
+                body = line.rstrip()
+                last = not body.endswith(b",")
+                todo = json.loads(body.rstrip(b","))
+                new = change(dict(todo))
+                found = todo if new is None else new
+                if new is not None:
+                    dst.write(_encode(new).encode("utf-8") + (b"\n" if last else b",\n"))
+                elif last:
+                    # Den slettede todo var sidst, så den forrige mister sit komma
+                    if prev is None:
+                        dst.seek(0)
+                        dst.write(b"[]\n")
+                        src.readline()  # "]"
+                    else:
+                        dst.seek(-len(prev), os.SEEK_CUR)
+                        stripped = prev.rstrip()
+                        dst.write(stripped[:-1] + prev[len(stripped):])
+                # Resten af filen er uændret og kopieres som den er, inkl. "]"
+                shutil.copyfileobj(src, dst)
+                dst.truncate()
+                break
+        if found is None:
+            os.remove(tmp_path)
+        else:
+            shutil.copymode(path, tmp_path)
+            os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return found
@@ -0,0 +1,155 @@
+"""Per-tenant stores med en LRU-cache af åbne TodoManagers.
+
+Hver tenant (bruger eller liste) har sin egen store-fil, fordelt i
+undermapper efter et hash af navnet, så en mappe ikke ender med tusindvis
+af filer:
+
+    <data_dir>/tenants/3f/alice.json
+
+Vedhæftede filer ligger tilsvarende i <upload_root>/tenants/3f/alice/.
+
+Tenanten "default" bruger DATA_FILE og upload-roden, så eksisterende
+installationer uden tenant-header fortsætter med den gamle todos.json.
+"""
+
+import hashlib
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from . import metrics
+from .todo import TodoManager
+
+DEFAULT_TENANT = "default"
+TENANT_RE = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+
+OPEN_SECONDS = metrics.histogram("todo_tenant_open_seconds", "Time spent opening a tenant store.")
+EVICTIONS = metrics.counter("todo_tenant_evictions_total", "Tenant managers evicted from the cache.", ["reason"])
+
+
+class InvalidTenantError(ValueError):
+    """Raised when a tenant name is not allowed."""
+    pass
+
+
+def validate_tenant(tenant):
+    if not TENANT_RE.match(tenant or ""):
+        raise InvalidTenantError(f"Ugyldigt tenant-navn: {tenant!r}")
+
+
+def tenant_for_user(username):
+    """Tenant for et login-navn.
+
+    Navne der ikke er gyldige tenant-navne, fx "alice@example.com", mappes
+    til en nøgle afledt af et hash, så de stadig kan bruges som filnavn.
+    """
+    if TENANT_RE.match(username):
+        return username
+    return "u-" + hashlib.sha256(username.encode("utf-8")).hexdigest()[:32]
+
+
+def _shard(tenant):
+    return hashlib.sha1(tenant.encode("utf-8")).hexdigest()[:2]
+
+
+def shard_path(data_dir, tenant):
+    """Sti til tenant'ens store-fil; None betyder DATA_FILE."""
+    if tenant == DEFAULT_TENANT:
+        return None
+    return os.path.join(data_dir, "tenants", _shard(tenant), f"{tenant}.json")
+
+
+def upload_dir(upload_root, tenant):
+    """Mappe til tenant'ens vedhæftede filer, fordelt som shard_path.
+
+    Tenanten "default" bruger upload_root, så eksisterende filer virker.
+    """
+    validate_tenant(tenant)
+    if tenant == DEFAULT_TENANT:
+        return upload_root
+    return os.path.join(upload_root, "tenants", _shard(tenant), tenant)
+
+
+class _Entry:
+    def __init__(self, path):
+        self.path = path
+        # lazy=True: filen indlæses først under tenant-låsen, ikke under den globale lås
+        self.manager = TodoManager(lazy=True, data_file=path)
+        self.lock = threading.Lock()
+        self.ready = False
+        self.users = 0
+        self.last_used = time.monotonic()
+
+
+class TenantManagers:
+    """LRU af åbne TodoManagers, én pr. tenant.
+
+    Den globale lås holdes kun mens cachen slås op; selve arbejdet sker
+    under tenant'ens egen lås, så skrivninger til forskellige tenants aldrig
+    venter på hinanden. Managers i brug bliver aldrig evicted.
+    """
+
+    def __init__(self, data_dir=".", max_open=1000, idle_seconds=600):
+        self.data_dir = data_dir
+        self.max_open = max_open
+        self.idle_seconds = idle_seconds
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _evict(self, now):
+        # Ældst brugte ligger først; stop ved første tenant der ikke må smides ud
+        for tenant, entry in list(self._entries.items()):
+            idle = now - entry.last_used > self.idle_seconds
+            full = len(self._entries) > self.max_open
+            if not (idle or full):
+                break
+            if entry.users:
+                continue
+            # TodoManager gemmer ved hver ændring, så der er intet ventende at
+            # flushe; at droppe manageren frigiver den indlæste liste.
+            del self._entries[tenant]
+            EVICTIONS.inc(reason="idle" if idle else "capacity")
+
+    @contextmanager
+    def checkout(self, tenant):
+        """Giv eksklusiv adgang til tenant'ens manager i with-blokken."""
+        validate_tenant(tenant)
+
+        with self._lock:
+            now = time.monotonic()
+            entry = self._entries.get(tenant)
+            if entry is None:
+                entry = self._entries[tenant] = _Entry(shard_path(self.data_dir, tenant))
+            else:
+                self._entries.move_to_end(tenant)
+            entry.users += 1
+            entry.last_used = now
+            self._evict(now)
+
+        try:
+            with entry.lock:
+                if not entry.ready:
+                    with OPEN_SECONDS.time():
+                        if entry.path is not None:
+                            os.makedirs(os.path.dirname(entry.path), exist_ok=True)
+                        entry.manager.todos  # indlæs store'et
+                    entry.ready = True
+                yield entry.manager
+        finally:
+            with self._lock:
+                entry.users -= 1
+                entry.last_used = time.monotonic()
+
+    def evict_idle(self):
+        with self._lock:
+            self._evict(time.monotonic())
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
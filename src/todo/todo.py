@@ -1,5 +1,8 @@
 import json
 import os
+from itertools import islice
+
+from . import metrics, storage
 
 DATA_FILE = "todos.json"
 
@@ -11,26 +14,117 @@ DEFAULTS = {
     "todoist_id": "",
 }
 
+_ENCODER = json.JSONEncoder(ensure_ascii=False)
+
+LOAD_SECONDS = metrics.histogram("todo_storage_load_seconds", "Time spent reading and parsing the todo store.")
+SAVE_SECONDS = metrics.histogram("todo_storage_save_seconds", "Time spent serializing and writing the todo store.")
+BYTES_READ = metrics.counter("todo_storage_bytes_read_total", "Bytes read from the todo store.")
+BYTES_WRITTEN = metrics.counter("todo_storage_bytes_written_total", "Bytes written to the todo store.")
+
+
+def _with_defaults(todo):
+    for key, default in DEFAULTS.items():
+        if key not in todo:
+            todo[key] = default
+    return todo
+
+
+def _apply_edit(todo, new_text=None, category=None, priority=None, deadline=None, attachment=None, todoist_id=None):
+    if new_text is not None:
+        todo["text"] = new_text
+    if category is not None:
+        todo["category"] = category
+    if priority is not None:
+        todo["priority"] = priority
+    if deadline is not None:
+        todo["deadline"] = deadline
+    if attachment is not None:
+        todo["attachment"] = attachment
+    if todoist_id is not None:
+        todo["todoist_id"] = todoist_id
+    return todo
+
 
 class TodoManager:
-    def __init__(self):
-        self.todos = []
-        self._load()
+    def __init__(self, lazy=False, data_file=None):
+        """Med lazy=True indlæses store'et først når todos tilgås.
+
+        Indtil da skrives add/toggle/complete/edit/delete direkte i filen
+        via storage-modulet, så CLI-kommandoer som "add" og "done <id>" ikke
+        skal parse og serialisere hele store'et.
+
+        data_file vælger en anden store-fil end DATA_FILE, fx pr. tenant.
+        """
+        self.data_file = data_file if data_file is not None else DATA_FILE
+        self._todos = None
+        if not lazy:
+            self._load()
+
+    @property
+    def todos(self):
+        if self._todos is None:
+            self._load()
+        return self._todos
+
+    @todos.setter
+    def todos(self, value):
+        self._todos = value
+
+    def _streaming(self):
+        return self._todos is None and storage.is_line_format(self.data_file)
+
+    def _update_in_file(self, todo_id, change):
+        with SAVE_SECONDS.time():
+            todo = storage.update(self.data_file, todo_id, lambda t: change(_with_defaults(t)))
+        if todo is not None:
+            BYTES_WRITTEN.inc(os.path.getsize(self.data_file))
+            _with_defaults(todo)
+        return todo
+
+    def _save_one(self, todo_id, todo):
+        """Gem én ændret (eller slettet, todo=None) todo fra den indlæste liste.
+
+        I linjeformatet skrives kun dens linje om, så en sync med tusindvis af
+        ændringer ikke serialiserer hele store'et for hver af dem.
+        """
+        if storage.is_line_format(self.data_file):
+            with SAVE_SECONDS.time():
+                found = storage.update(self.data_file, todo_id, lambda t: None if todo is None else dict(todo))
+            if found is not None:
+                BYTES_WRITTEN.inc(os.path.getsize(self.data_file))
+                return
+        self._save()
 
     def _load(self):
-        if os.path.exists(DATA_FILE):
-            with open(DATA_FILE, "r", encoding="utf-8") as f:
-                self.todos = json.load(f)
+        self._todos = []
+        if os.path.exists(self.data_file):
+            with LOAD_SECONDS.time():
+                with open(self.data_file, "r", encoding="utf-8") as f:
+                    self.todos = json.load(f)
+            BYTES_READ.inc(os.path.getsize(self.data_file))
             for todo in self.todos:
-                for key, default in DEFAULTS.items():
-                    if key not in todo:
-                        todo[key] = default
+                _with_defaults(todo)
 
     def _save(self):
-        with open(DATA_FILE, "w", encoding="utf-8") as f:
-            json.dump(self.todos, f, ensure_ascii=False, indent=2)
+        # Én todo pr. linje: stadig gyldig JSON, men bruger den hurtige C-encoder
+        # pr. element i stedet for json.dump(indent=2), som er ren Python.
+        # Linjerne skrives én ad gangen, så hele filen aldrig ligger i hukommelsen.
+        encode = _ENCODER.encode
+        with SAVE_SECONDS.time():
+            with open(self.data_file, "w", encoding="utf-8") as f:
+                if self.todos:
+                    f.write("[\n" + encode(self.todos[0]))
+                    f.writelines(",\n" + encode(todo) for todo in islice(self.todos, 1, None))
+                    f.write("\n]\n")
+                else:
+                    f.write("[]\n")
+        BYTES_WRITTEN.inc(os.path.getsize(self.data_file))
 
     def _next_id(self):
+        if self._streaming():
+            # Todos tilføjes altid i slutningen, så den sidste linje har det højeste id
+            last = storage.last_todo(self.data_file)
+            return last["id"] + 1 if last else 1
         if not self.todos:
             return 1
         return max(t["id"] for t in self.todos) + 1
@@ -46,52 +140,94 @@ class TodoManager:
             "attachment": attachment,
             "todoist_id": todoist_id,
         }
+        if self._streaming():
+            with SAVE_SECONDS.time():
+                BYTES_WRITTEN.inc(storage.append(self.data_file, todo))
+            return todo
         self.todos.append(todo)
-        self._save()
+        if storage.is_line_format(self.data_file):
+            with SAVE_SECONDS.time():
+                BYTES_WRITTEN.inc(storage.append(self.data_file, todo))
+        else:
+            self._save()
         return todo
 
+    def add_many(self, items):
+        """Tilføj mange todos med én id-allokering og én skrivning til disk.
+
+        items er dicts med samme felter som add(); manglende felter får
+        standardværdier. Returnerer antallet af tilføjede todos.
+        """
+        next_id = self._next_id()
+        new = []
+        for item in items:
+            todo = {"id": next_id + len(new), "text": item["text"], "done": bool(item.get("done", False))}
+            for key, default in DEFAULTS.items():
+                todo[key] = item.get(key, default)
+            new.append(todo)
+        if not new:
+            return 0
+        if storage.is_line_format(self.data_file) or not os.path.exists(self.data_file):
+            # Kun de nye todos encodes og skrives; resten af filen røres ikke
+            with SAVE_SECONDS.time():
+                BYTES_WRITTEN.inc(storage.append_many(self.data_file, new))
+            if self._todos is not None:
+                self._todos.extend(new)
+        else:
+            # Gammelt format: skriv hele store'et om én gang i linjeformatet
+            self.todos.extend(new)
+            self._save()
+        return len(new)
+
     def toggle_done(self, todo_id):
+        if self._streaming():
+            return self._update_in_file(todo_id, lambda t: dict(t, done=not t["done"]))
         for todo in self.todos:
             if todo["id"] == todo_id:
                 todo["done"] = not todo["done"]
-                self._save()
+                self._save_one(todo_id, todo)
                 return todo
         return None
 
     def complete(self, todo_id):
+        if self._streaming():
+            return self._update_in_file(todo_id, lambda t: dict(t, done=True))
         for todo in self.todos:
             if todo["id"] == todo_id:
                 todo["done"] = True
-                self._save()
+                self._save_one(todo_id, todo)
                 return todo
         return None
 
     def edit(self, todo_id, new_text=None, category=None, priority=None, deadline=None, attachment=None, todoist_id=None):
+        fields = dict(new_text=new_text, category=category, priority=priority,
+                      deadline=deadline, attachment=attachment, todoist_id=todoist_id)
+        if self._streaming():
+            return self._update_in_file(todo_id, lambda t: _apply_edit(t, **fields))
         for todo in self.todos:
             if todo["id"] == todo_id:
-                if new_text is not None:
-                    todo["text"] = new_text
-                if category is not None:
-                    todo["category"] = category
-                if priority is not None:
-                    todo["priority"] = priority
-                if deadline is not None:
-                    todo["deadline"] = deadline
-                if attachment is not None:
-                    todo["attachment"] = attachment
-                if todoist_id is not None:
-                    todo["todoist_id"] = todoist_id
-                self._save()
+                _apply_edit(todo, **fields)
+                self._save_one(todo_id, todo)
                 return todo
         return None
 
     def delete(self, todo_id):
+        if self._streaming():
+            return self._update_in_file(todo_id, lambda t: None)
         for i, todo in enumerate(self.todos):
             if todo["id"] == todo_id:
                 removed = self.todos.pop(i)
-                self._save()
+                self._save_one(todo_id, None)
                 return removed
         return None
 
     def list(self):
         return self.todos
+
+    def iter(self):
+        """Gennemløb todos uden at holde hele store'et i hukommelsen, hvis det ikke er indlæst."""
+        if self._todos is not None:
+            yield from self._todos
+            return
+        for todo in storage.iter_todos(self.data_file):
+            yield _with_defaults(todo)
@@ -1,12 +1,28 @@
 import importlib
+import time
 import requests
 
+from todo import mappings, metrics
+
 try:
     import config as _config_module
 except ImportError:
     _config_module = None
 
 
+API_SECONDS = metrics.histogram(
+    "todoist_api_request_seconds", "Latency of calls to the Todoist REST API.", ["method"])
+API_RESPONSES = metrics.counter(
+    "todoist_api_responses_total", "Todoist REST API responses by status code.", ["method", "status"])
+API_FAILURES = metrics.counter(
+    "todoist_api_failures_total", "Todoist REST API calls that raised before a response.", ["method"])
+SYNC_PHASE_SECONDS = metrics.histogram(
+    "todoist_sync_phase_seconds", "Time spent in each step of full_sync.", ["phase"])
+SYNC_SECONDS = metrics.histogram("todoist_sync_seconds", "Total duration of full_sync.")
+SYNC_ITEMS = metrics.counter(
+    "todoist_sync_items_total", "Tasks handled by full_sync, by outcome.", ["outcome"])
+
+
 class TodoistSyncError(Exception):
     """Raised on Todoist API errors."""
     pass
@@ -14,21 +30,8 @@ class TodoistSyncError(Exception):
 
 class TodoistSync:
     # Mapping mellem Todoist projekt-navne og lokale kategorier
-    PROJECT_TO_CATEGORY = {
-        "work": "Arbejde",
-        "arbejde": "Arbejde",
-        "personal": "Privat",
-        "privat": "Privat",
-        "shopping": "Indkøb",
-        "indkøb": "Indkøb",
-        "groceries": "Indkøb",
-    }
-
-    CATEGORY_TO_PROJECT = {
-        "Arbejde": "Arbejde",
-        "Privat": "Privat",
-        "Indkøb": "Indkøb",
-    }
+    PROJECT_TO_CATEGORY = mappings.PROJECT_TO_CATEGORY
+    CATEGORY_TO_PROJECT = mappings.CATEGORY_TO_PROJECT
 
     def __init__(self, manager):
         self.manager = manager
@@ -61,24 +64,32 @@ class TodoistSync:
 
     # ── HTTP helpers ─────────────────────────────────────────────────────────
 
-    def _get(self, path):
+    def _request(self, method, path, **kwargs):
         url = f"{self._get_base()}{path}"
-        resp = requests.get(url, headers=self._get_headers(), timeout=15)
+        start = time.perf_counter()
+        try:
+            resp = requests.request(method, url, headers=self._get_headers(), timeout=15, **kwargs)
+        except requests.RequestException:
+            API_FAILURES.inc(method=method)
+            raise
+        finally:
+            API_SECONDS.observe(time.perf_counter() - start, method=method)
+        API_RESPONSES.inc(method=method, status=resp.status_code)
         self._check_response(resp)
+        return resp
+
+    def _get(self, path):
+        resp = self._request("GET", path)
         return resp.json()
 
     def _post(self, path, data=None):
-        url = f"{self._get_base()}{path}"
-        resp = requests.post(url, headers=self._get_headers(), json=data or {}, timeout=15)
-        self._check_response(resp)
+        resp = self._request("POST", path, json=data or {})
         if resp.status_code == 204 or not resp.content:
             return {}
         return resp.json()
 
     def _delete(self, path):
-        url = f"{self._get_base()}{path}"
-        resp = requests.delete(url, headers=self._get_headers(), timeout=15)
-        self._check_response(resp)
+        self._request("DELETE", path)
         return {}
 
     def _check_response(self, resp):
@@ -117,29 +128,17 @@ class TodoistSync:
         if not project_id:
             return ""
         name = self._project_id_cache.get(project_id, "")
-        # Ignorer Inbox - det er Todoist's default og matcher ikke en lokal kategori
-        if name.lower() == "inbox":
-            return ""
-        # Tjek om projektet mapper til en lokal kategori
-        mapped = self.PROJECT_TO_CATEGORY.get(name.lower())
-        if mapped:
-            return mapped
-        # Ellers brug projekt-navnet direkte hvis det matcher en kategori
-        if name in self.CATEGORY_TO_PROJECT:
-            return name
-        return ""
+        return mappings.project_name_to_category(name)
 
     # ── Priority mapping ─────────────────────────────────────────────────────
 
     @staticmethod
     def _local_to_api_priority(priority):
-        mapping = {"Høj": 4, "Medium": 2, "Lav": 1}
-        return mapping.get(priority, 1)
+        return mappings.local_to_api_priority(priority)
 
     @staticmethod
     def _api_to_local_priority(api_priority):
-        mapping = {4: "Høj", 3: "Høj", 2: "Medium", 1: "Lav"}
-        return mapping.get(api_priority, "Medium")
+        return mappings.api_to_local_priority(api_priority)
 
     # ── Task CRUD on Todoist ─────────────────────────────────────────────────
 
@@ -210,11 +209,15 @@ class TodoistSync:
             "errors": [],
         }
 
+        sync_start = time.perf_counter()
+
         # 1. Load projects
-        self._load_projects()
+        with SYNC_PHASE_SECONDS.time(phase="load_projects"):
+            self._load_projects()
 
         # 2. Fetch all active Todoist tasks
-        todoist_tasks = self._get("/tasks")
+        with SYNC_PHASE_SECONDS.time(phase="fetch_tasks"):
+            todoist_tasks = self._get("/tasks")
 
         # 3. Build lookup maps
         todoist_by_id = {str(t["id"]): t for t in todoist_tasks}
@@ -244,7 +247,11 @@ class TodoistSync:
                 local_without_link.append(todo)
 
         # 4. Håndter linkede tasks - tjek done status FØRST
+        # Close og update er flettet i samme løkke, så tiden summeres pr. fase
+        phase_time = {"close": 0.0, "update": 0.0}
         for tid, local_todo in list(local_by_todoist_id.items()):
+            started = time.perf_counter()
+            phase = "update" if not local_todo["done"] and tid in todoist_by_id else "close"
             # Hvis lokal er done -> luk på Todoist og unlink
             if local_todo["done"]:
                 if tid in todoist_by_id:
@@ -275,31 +282,41 @@ class TodoistSync:
                     result["completed"] += 1
                 except Exception as e:
                     result["errors"].append(f"Complete lokal #{local_todo['id']}: {e}")
+            phase_time[phase] += time.perf_counter() - started
+        for phase, seconds in phase_time.items():
+            SYNC_PHASE_SECONDS.observe(seconds, phase=phase)
 
         # 5. New Todoist tasks (not linked to any local task)
-        linked_todoist_ids = set(local_by_todoist_id.keys())
-        for tid, remote in todoist_by_id.items():
-            if tid not in linked_todoist_ids:
-                try:
-                    self._create_local_from_remote(remote)
-                    result["pulled"] += 1
-                except Exception as e:
-                    result["errors"].append(f"Pull todoist #{tid}: {e}")
+        with SYNC_PHASE_SECONDS.time(phase="pull"):
+            linked_todoist_ids = set(local_by_todoist_id.keys())
+            for tid, remote in todoist_by_id.items():
+                if tid not in linked_todoist_ids:
+                    try:
+                        self._create_local_from_remote(remote)
+                        result["pulled"] += 1
+                    except Exception as e:
+                        result["errors"].append(f"Pull todoist #{tid}: {e}")
 
         # 6. New local tasks (no todoist_id, not done) -> push to Todoist
-        for local_todo in local_without_link:
-            if local_todo["done"]:
-                continue
-            try:
-                created = self._create_todoist_task(local_todo)
-                self.manager.edit(local_todo["id"], todoist_id=str(created["id"]))
-                result["pushed"] += 1
-            except Exception as e:
-                result["errors"].append(f"Push lokal #{local_todo['id']}: {e}")
+        with SYNC_PHASE_SECONDS.time(phase="push"):
+            for local_todo in local_without_link:
+                if local_todo["done"]:
+                    continue
+                try:
+                    created = self._create_todoist_task(local_todo)
+                    self.manager.edit(local_todo["id"], todoist_id=str(created["id"]))
+                    result["pushed"] += 1
+                except Exception as e:
+                    result["errors"].append(f"Push lokal #{local_todo['id']}: {e}")
 
         if result["errors"]:
             result["success"] = False
 
+        SYNC_SECONDS.observe(time.perf_counter() - sync_start)
+        for outcome in ("pulled", "pushed", "updated", "completed"):
+            SYNC_ITEMS.inc(result[outcome], outcome=outcome)
+        SYNC_ITEMS.inc(len(result["errors"]), outcome="error")
+
         return result
 
     def _update_local_from_remote_keep_local(self, local_todo, remote):
@@ -1,15 +1,31 @@
 // ── State ────────────────────────────────────────────────────────────────────
 let todos = [];
+let todoById = new Map();
 let selectedId = null;
 let activeCategory = "Alle";
 let activeFilter = "alle"; // "alle", "done", "active", "overdue"
 let sortMode = "newest";
 let syncInProgress = false;
+let stats = { total: 0, done: 0, overdue: 0, byCat: {} };
 
 const CATEGORIES   = ["Alle", "Arbejde", "Privat", "Indkøb"];
 const CAT_ICONS    = { Alle: "☰", Arbejde: "⚒", Privat: "⌂", Indkøb: "☷" };
 const PRI_ORDER    = { "Høj": 0, "Medium": 1, "Lav": 2 };
 
+// Virtuel liste: kun rækker i (og lige omkring) synsfeltet har DOM-elementer
+const ROW_ESTIMATE = 86;   // px inkl. margin, bruges indtil rækken er målt
+const ROW_GAP      = 8;    // .todo-card margin-bottom
+const OVERSCAN     = 6;    // ekstra rækker over og under synsfeltet
+const SEARCH_DELAY = 150;  // ms debounce på søgefeltet
+
+let view = [];                 // filtreret og sorteret liste der vises
+let viewDirty = true;
+let offsets = [0];             // offsets[i] = top af række i; sidste = total højde
+const rowHeights = new Map();  // id -> målt højde
+const rowEls = new Map();      // id -> DOM-element for renderede rækker
+let scrollFrame = null;
+let searchTimer = null;
+
 // ── API helpers ──────────────────────────────────────────────────────────────
 
 async function api(path, opts = {}) {
@@ -20,27 +36,104 @@ async function api(path, opts = {}) {
   return res.json();
 }
 
-async function fetchTodos()          { todos = await api("/todos"); render(); }
-async function addTodo(data)         { await api("/todos", { method: "POST", body: JSON.stringify(data) }); await fetchTodos(); }
-async function toggleTodo(id)        { await api(`/todos/${id}/toggle`, { method: "PATCH" }); await fetchTodos(); }
-async function deleteTodo(id)        { await api(`/todos/${id}`, { method: "DELETE" }); if (selectedId === id) selectedId = null; await fetchTodos(); }
-async function updateTodo(id, data)  { await api(`/todos/${id}`, { method: "PUT", body: JSON.stringify(data) }); await fetchTodos(); }
+// Mutationer bruger serverens svar til at opdatere den lokale liste, så kun
+// de berørte rækker gen-renderes. Ved fejl hentes hele listen igen.
+async function fetchTodos()          { setTodos(await api("/todos")); render(); }
+async function addTodo(data)         { applyAdded(await api("/todos", { method: "POST", body: JSON.stringify(data) })) || await fetchTodos(); }
+async function toggleTodo(id)        { applyChange(await api(`/todos/${id}/toggle`, { method: "PATCH" })) || await fetchTodos(); }
+async function deleteTodo(id)        { applyRemoved(await api(`/todos/${id}`, { method: "DELETE" })) || await fetchTodos(); }
+async function updateTodo(id, data)  { applyChange(await api(`/todos/${id}`, { method: "PUT", body: JSON.stringify(data) })) || await fetchTodos(); }
+
+// ── Local state ──────────────────────────────────────────────────────────────
+
+function setTodos(list) {
+  todos = list;
+  todoById = new Map(list.map(t => [t.id, t]));
+  stats = { total: 0, done: 0, overdue: 0, byCat: {} };
+  for (const t of todos) countTodo(t, 1);
+  viewDirty = true;
+}
 
-// ── Filtering & sorting ─────────────────────────────────────────────────────
+function countTodo(t, sign) {
+  stats.total += sign;
+  if (t.done) stats.done += sign;
+  if (isOverdue(t)) stats.overdue += sign;
+  if (t.category) stats.byCat[t.category] = (stats.byCat[t.category] || 0) + sign;
+}
 
-function getFiltered() {
-  let list = [...todos];
+function sortKey(t) {
+  if (sortMode === "priority") return t.priority;
+  if (sortMode === "alpha")    return t.text;
+  return null;
+}
 
-  if (activeCategory !== "Alle") {
-    list = list.filter(t => t.category === activeCategory);
-  }
+function applyChange(updated) {
+  const existing = updated && todoById.get(updated.id);
+  if (!existing) return false;
+
+  const q = currentQuery();
+  const wasVisible = matchesFilters(existing, q);
+  const oldKey = sortKey(existing);
 
-  if (activeFilter === "done")    list = list.filter(t => t.done);
-  if (activeFilter === "active")  list = list.filter(t => !t.done);
-  if (activeFilter === "overdue") list = list.filter(t => isOverdue(t));
+  countTodo(existing, -1);
+  Object.assign(existing, updated);
+  countTodo(existing, 1);
 
-  const q = document.getElementById("search").value.trim().toLowerCase();
-  if (q) list = list.filter(t => t.text.toLowerCase().includes(q));
+  // Kun hvis rækken skifter synlighed eller plads skal listen beregnes igen
+  if (matchesFilters(existing, q) !== wasVisible || sortKey(existing) !== oldKey) viewDirty = true;
+  refresh(existing.id === selectedId);
+  return true;
+}
+
+function applyAdded(todo) {
+  if (!todo || todo.id === undefined) return false;
+  todos.push(todo);
+  todoById.set(todo.id, todo);
+  countTodo(todo, 1);
+  viewDirty = true;
+  refresh(false);
+  return true;
+}
+
+function applyRemoved(removed) {
+  const existing = removed && todoById.get(removed.id);
+  if (!existing) return false;
+  todos.splice(todos.indexOf(existing), 1);
+  todoById.delete(existing.id);
+  rowHeights.delete(existing.id);
+  countTodo(existing, -1);
+  const wasSelected = existing.id === selectedId;
+  if (wasSelected) selectedId = null;
+  viewDirty = true;
+  refresh(wasSelected);
+  return true;
+}
+
+function refresh(detail) {
+  renderSidebar();
+  renderList();
+  renderStatusbar();
+  if (detail) renderDetail();
+}
+
+// ── Filtering & sorting ─────────────────────────────────────────────────────
+
+function currentQuery() {
+  return document.getElementById("search").value.trim().toLowerCase();
+}
+
+function matchesFilters(t, q) {
+  if (activeCategory !== "Alle" && t.category !== activeCategory) return false;
+  if (activeFilter === "done"    && !t.done) return false;
+  if (activeFilter === "active"  && t.done) return false;
+  if (activeFilter === "overdue" && !isOverdue(t)) return false;
+  if (q && !t.text.toLowerCase().includes(q)) return false;
+  return true;
+}
+
+function getFiltered() {
+  const q = currentQuery();
+  const list = todos.filter(t => matchesFilters(t, q));
 
   if (sortMode === "newest")      list.sort((a, b) => b.id - a.id);
   else if (sortMode === "oldest") list.sort((a, b) => a.id - b.id);
@@ -60,16 +153,10 @@ function render() {
 }
 
 function renderSidebar() {
-  const total  = todos.length;
-  const done   = todos.filter(t => t.done).length;
-  const active = total - done;
-
-  const overdue = todos.filter(t => isOverdue(t)).length;
-
-  document.getElementById("stat-total").textContent   = total;
-  document.getElementById("stat-done").textContent    = done;
-  document.getElementById("stat-active").textContent  = active;
-  document.getElementById("stat-overdue").textContent = overdue;
+  document.getElementById("stat-total").textContent   = stats.total;
+  document.getElementById("stat-done").textContent    = stats.done;
+  document.getElementById("stat-active").textContent  = stats.total - stats.done;
+  document.getElementById("stat-overdue").textContent = stats.overdue;
 
   // Highlight active stat filter
   document.querySelectorAll(".stat-row[data-filter]").forEach(row => {
@@ -80,7 +167,7 @@ function renderSidebar() {
     const cat = btn.dataset.cat;
     btn.classList.toggle("active", cat === activeCategory);
 
-    let count = cat === "Alle" ? total : todos.filter(t => t.category === cat).length;
+    let count = cat === "Alle" ? stats.total : stats.byCat[cat] || 0;
     const badge = btn.querySelector(".badge");
     badge.textContent = count || "";
   });
@@ -88,9 +175,15 @@ function renderSidebar() {
 
 function renderList() {
   const container = document.getElementById("todo-list");
-  const filtered = getFiltered();
 
-  if (!filtered.length) {
+  if (viewDirty) {
+    view = getFiltered();
+    viewDirty = false;
+    computeOffsets();
+  }
+
+  if (!view.length) {
+    rowEls.clear();
     container.innerHTML = `
       <div class="empty-state">
         <div class="icon">☐</div>
@@ -100,31 +193,129 @@ function renderList() {
     return;
   }
 
-  container.innerHTML = filtered.map(t => {
-    const priClass = t.priority === "Høj" ? "pri-high" : t.priority === "Lav" ? "pri-low" : "pri-medium";
-    const priBadge = t.priority === "Høj" ? "badge-pri-high" : t.priority === "Lav" ? "badge-pri-low" : "badge-pri-medium";
-    const doneClass = t.done ? "done" : "";
-    const selClass  = t.id === selectedId ? "selected" : "";
-    const overdueClass = isOverdue(t) ? "overdue" : "";
-
-    let meta = "";
-    if (t.priority) meta += `<span class="badge ${priBadge}">${t.priority}</span>`;
-    if (t.category) meta += `<span class="badge badge-cat">${CAT_ICONS[t.category] || ""} ${t.category}</span>`;
-    if (t.deadline) {
-      const dlBadgeClass = isOverdue(t) ? "badge-deadline badge-overdue" : "badge-deadline";
-      meta += `<span class="badge ${dlBadgeClass}">${formatDate(t.deadline)}${isOverdue(t) ? " — overskredet!" : ""}</span>`;
+  if (!document.getElementById("pad-top")) {
+    rowEls.clear();
+    container.innerHTML = `<div class="virtual-pad" id="pad-top"></div><div class="virtual-pad" id="pad-bottom"></div>`;
+  }
+  renderWindow(true);
+}
+
+function computeOffsets() {
+  offsets = new Array(view.length + 1);
+  offsets[0] = 0;
+  for (let i = 0; i < view.length; i++) {
+    offsets[i + 1] = offsets[i] + (rowHeights.get(view[i].id) || ROW_ESTIMATE);
+  }
+}
+
+function rowAt(y) {
+  // Binær søgning efter den sidste række hvis top er <= y
+  let lo = 0, hi = view.length - 1;
+  while (lo < hi) {
+    const mid = (lo + hi + 1) >> 1;
+    if (offsets[mid] <= y) lo = mid;
+    else hi = mid - 1;
+  }
+  return lo;
+}
+
+function renderWindow(animate = false) {
+  const container = document.getElementById("todo-list");
+  const padTop = document.getElementById("pad-top");
+  const padBottom = document.getElementById("pad-bottom");
+  if (!view.length || !padTop) return;
+
+  const start = Math.max(0, rowAt(container.scrollTop) - OVERSCAN);
+  const end = Math.min(view.length, rowAt(container.scrollTop + container.clientHeight) + 1 + OVERSCAN);
+
+  const wanted = new Set();
+  for (let i = start; i < end; i++) wanted.add(view[i].id);
+  for (const [id, el] of rowEls) {
+    if (!wanted.has(id)) { el.remove(); rowEls.delete(id); }
+  }
+
+  // Keyed diff: genbrug eksisterende rækker, opdater kun dem der har ændret sig
+  let cursor = padTop.nextSibling;
+  for (let i = start; i < end; i++) {
+    const t = view[i];
+    let el = rowEls.get(t.id);
+    if (!el) {
+      el = document.createElement("div");
+      // Rækker der dukker op under scroll skal ikke fade ind
+      el._noAnim = !animate;
+      rowEls.set(t.id, el);
+    }
+    const sig = rowSignature(t);
+    if (el._sig !== sig) {
+      fillRow(el, t);
+      el._sig = sig;
     }
-    if (t.attachment) meta += `<span class="badge badge-attachment">📎 Fil</span>`;
+    if (el === cursor) cursor = cursor.nextSibling;
+    else container.insertBefore(el, cursor);
+  }
 
-    return `
-      <div class="todo-card ${priClass} ${doneClass} ${selClass} ${overdueClass}" data-id="${t.id}" onclick="selectTodo(${t.id})">
+  padTop.style.height = `${offsets[start]}px`;
+  padBottom.style.height = `${offsets[view.length] - offsets[end]}px`;
+
+  if (measureRows(start, end)) {
+    computeOffsets();
+    padTop.style.height = `${offsets[start]}px`;
+    padBottom.style.height = `${offsets[view.length] - offsets[end]}px`;
+    // Målte højder kan afvige fra estimatet; render vinduet igen næste frame
+    handleListScroll();
+  }
+}
+
+function measureRows(start, end) {
+  let changed = false;
+  for (let i = start; i < end; i++) {
+    const id = view[i].id;
+    const height = rowEls.get(id).offsetHeight + ROW_GAP;
+    if (rowHeights.get(id) !== height) {
+      rowHeights.set(id, height);
+      changed = true;
+    }
+  }
+  return changed;
+}
+
+function handleListScroll() {
+  if (scrollFrame) return;
+  scrollFrame = requestAnimationFrame(() => {
+    scrollFrame = null;
+    renderWindow(false);
+  });
+}
+
+function rowSignature(t) {
+  return [t.text, t.done, t.priority, t.category, t.deadline, t.attachment, t.id === selectedId, isOverdue(t)].join("\u0000");
+}
+
+function fillRow(el, t) {
+  const priClass = t.priority === "Høj" ? "pri-high" : t.priority === "Lav" ? "pri-low" : "pri-medium";
+  const priBadge = t.priority === "Høj" ? "badge-pri-high" : t.priority === "Lav" ? "badge-pri-low" : "badge-pri-medium";
+  const doneClass = t.done ? "done" : "";
+  const selClass  = t.id === selectedId ? "selected" : "";
+  const overdueClass = isOverdue(t) ? "overdue" : "";
+
+  let meta = "";
+  if (t.priority) meta += `<span class="badge ${priBadge}">${t.priority}</span>`;
+  if (t.category) meta += `<span class="badge badge-cat">${CAT_ICONS[t.category] || ""} ${t.category}</span>`;
+  if (t.deadline) {
+    const dlBadgeClass = isOverdue(t) ? "badge-deadline badge-overdue" : "badge-deadline";
+    meta += `<span class="badge ${dlBadgeClass}">${formatDate(t.deadline)}${isOverdue(t) ? " — overskredet!" : ""}</span>`;
+  }
+  if (t.attachment) meta += `<span class="badge badge-attachment">📎 Fil</span>`;
+
+  el.className = `todo-card ${priClass} ${doneClass} ${selClass} ${overdueClass}${el._noAnim ? " no-anim" : ""}`;
+  el.dataset.id = t.id;
+  el.setAttribute("onclick", `selectTodo(${t.id})`);
+  el.innerHTML = `
         <div class="checkbox" onclick="event.stopPropagation(); toggleTodo(${t.id})">${t.done ? "✓" : ""}</div>
         <div class="todo-body">
           <div class="todo-text">${escapeHtml(t.text)}</div>
           ${meta ? `<div class="todo-meta">${meta}</div>` : ""}
-        </div>
-      </div>`;
-  }).join("");
+        </div>`;
 }
 
 function renderDetail() {
@@ -132,7 +323,7 @@ function renderDetail() {
   const empty = document.getElementById("detail-empty");
   const actions = document.getElementById("detail-actions");
 
-  const todo = todos.find(t => t.id === selectedId);
+  const todo = todoById.get(selectedId);
 
   if (!todo) {
     panel.style.display = "none";
@@ -204,10 +395,10 @@ function renderDetail() {
 }
 
 function renderStatusbar() {
-  const total   = todos.length;
-  const done    = todos.filter(t => t.done).length;
+  const total   = stats.total;
+  const done    = stats.done;
   const active  = total - done;
-  const overdue = todos.filter(t => isOverdue(t)).length;
+  const overdue = stats.overdue;
   let text = `≡  ${total} todos   ·   ✓ ${done} færdige   ·   ○ ${active} aktive`;
   if (overdue > 0) text += `   ·   ⚠ ${overdue} overskredet`;
   document.getElementById("statusbar").textContent = text;
@@ -217,26 +408,37 @@ function renderStatusbar() {
 
 function selectTodo(id) {
   selectedId = id;
-  render();
+  // Kun den gamle og den nye valgte række ændrer signatur og gen-renderes
+  renderWindow();
+  renderDetail();
+}
+
+function refilter() {
+  viewDirty = true;
+  document.getElementById("todo-list").scrollTop = 0;
+  renderList();
 }
 
 function selectCategory(cat) {
   activeCategory = cat;
-  render();
+  renderSidebar();
+  refilter();
 }
 
 function selectFilter(filter) {
   activeFilter = activeFilter === filter ? "alle" : filter;
-  render();
+  renderSidebar();
+  refilter();
 }
 
 function handleSort(value) {
   sortMode = value;
-  render();
+  refilter();
 }
 
 function handleSearch() {
-  render();
+  clearTimeout(searchTimer);
+  searchTimer = setTimeout(refilter, SEARCH_DELAY);
 }
 
 async function handleAdd() {
@@ -260,7 +462,7 @@ async function handleToggle() {
 }
 
 function handleEdit() {
-  const todo = todos.find(t => t.id === selectedId);
+  const todo = todoById.get(selectedId);
   if (!todo) return;
 
   document.getElementById("edit-text").value     = todo.text;
@@ -291,7 +493,7 @@ function closeModal() {
 }
 
 async function handleDelete() {
-  const todo = todos.find(t => t.id === selectedId);
+  const todo = todoById.get(selectedId);
   if (!todo) return;
   if (!confirm(`Er du sikker på du vil slette "${todo.text}"?`)) return;
   await deleteTodo(selectedId);
@@ -322,15 +524,14 @@ async function handleUpload(input) {
     return;
   }
 
-  await fetchTodos();
+  applyChange(await res.json()) || await fetchTodos();
 }
 
 async function handleRemoveAttachment() {
   if (!selectedId) return;
   if (!confirm("Er du sikker på du vil fjerne filen?")) return;
 
-  await fetch(`/api/todos/${selectedId}/attachment`, { method: "DELETE" });
-  await fetchTodos();
+  applyChange(await api(`/todos/${selectedId}/attachment`, { method: "DELETE" })) || await fetchTodos();
 }
 
 // Theme
@@ -450,7 +651,10 @@ async function checkSyncStatus() {
     const res = await fetch("/api/sync/status");
     const data = await res.json();
     const btn = document.getElementById("sync-btn");
-    if (!data.configured) {
+    if (!data.available) {
+      btn.disabled = true;
+      btn.title = "Todoist-sync er kun tilgængelig for standard-brugeren";
+    } else if (!data.configured) {
       btn.title = "Konfigurer API token i config.py";
     }
   } catch (e) {
@@ -482,6 +686,10 @@ document.addEventListener("DOMContentLoaded", () => {
     if (e.target === e.currentTarget) closeModal();
   });
 
+  // Virtuel liste: render nye rækker ved scroll og ændret vinduesstørrelse
+  document.getElementById("todo-list").addEventListener("scroll", handleListScroll, { passive: true });
+  window.addEventListener("resize", handleListScroll);
+
   fetchTodos();
   checkSyncStatus();
 });
@@ -0,0 +1,120 @@
+import sys
+import os
+import io
+import shutil
+import tempfile
+import importlib
+import unittest
+from importlib.util import find_spec
+
+ROOT = os.path.join(os.path.dirname(__file__), "..")
+sys.path.insert(0, os.path.join(ROOT, "src"))
+sys.path.insert(0, ROOT)
+
+import todo.todo as todo_module
+from todo.tenants import TenantManagers
+
+# Webserveren kræver flask og requests fra requirements.txt
+HAS_WEB_DEPS = find_spec("flask") is not None and find_spec("requests") is not None
+
+
+@unittest.skipUnless(HAS_WEB_DEPS, "flask og requests er ikke installeret")
+class TestTenantIsolation(unittest.TestCase):
+    def setUp(self):
+        import app as app_module
+        from benchmarks.run import configure_todoist
+        from benchmarks.todoist_stub import StubTodoist
+
+        self.workdir = tempfile.mkdtemp()
+        self.stub = StubTodoist().start()
+        # configure_todoist ændrer sys.path og config-modulet; genskabes i tearDown
+        self.saved_path = list(sys.path)
+        self.saved_config = sys.modules.get("config")
+        self.saved_data_file = todo_module.DATA_FILE
+        configure_todoist(self.workdir, self.stub.base_url)
+
+        todo_module.DATA_FILE = os.path.join(self.workdir, "todos.json")
+        self.app_module = app_module
+        self.saved = (app_module.tenants, app_module.UPLOAD_FOLDER)
+        app_module.tenants = TenantManagers(data_dir=self.workdir)
+        app_module.UPLOAD_FOLDER = os.path.join(self.workdir, "uploads")
+        app_module.last_sync_times.clear()
+        self.client = app_module.app.test_client()
+
+    def tearDown(self):
+        import todoist_sync
+
+        self.app_module.tenants, self.app_module.UPLOAD_FOLDER = self.saved
+        todo_module.DATA_FILE = self.saved_data_file
+        sys.path[:] = self.saved_path
+        if self.saved_config is None:
+            sys.modules.pop("config", None)
+        else:
+            sys.modules["config"] = self.saved_config
+        # todoist_sync holder en reference til config fra workdir; indlæs den igen
+        importlib.reload(todoist_sync)
+        self.stub.stop()
+        shutil.rmtree(self.workdir, ignore_errors=True)
+
+    def texts(self, tenant):
+        resp = self.client.get("/api/todos", headers={"X-Todo-Tenant": tenant})
+        return [t["text"] for t in resp.get_json()]
+
+    def test_sync_does_not_leak_between_tenants(self):
+        self.client.post("/api/todos", json={"text": "alice secret"}, headers={"X-Todo-Tenant": "alice"})
+        self.client.post("/api/todos", json={"text": "delt todo"})
+
+        resp = self.client.post("/api/sync", headers={"X-Todo-Tenant": "alice"})
+        self.assertEqual(resp.status_code, 403)
+        resp = self.client.post("/api/sync")
+        self.assertEqual(resp.status_code, 200)
+        resp = self.client.post("/api/sync", headers={"X-Todo-Tenant": "bob"})
+        self.assertEqual(resp.status_code, 403)
+
+        self.assertEqual([t["content"] for t in self.stub.tasks.values()], ["delt todo"])
+        self.assertEqual(self.texts("alice"), ["alice secret"])
+        self.assertEqual(self.texts("bob"), [])
+        self.assertEqual(self.texts("default"), ["delt todo"])
+        status = self.client.get("/api/sync/status", headers={"X-Todo-Tenant": "bob"}).get_json()
+        self.assertFalse(status["available"])
+
+    def test_uploads_are_served_only_to_owner(self):
+        alice = {"X-Todo-Tenant": "alice"}
+        todo = self.client.post("/api/todos", json={"text": "Kvittering"}, headers=alice).get_json()
+        resp = self.client.post(f"/api/todos/{todo['id']}/upload", headers=alice,
+                                data={"file": (io.BytesIO(b"hemmelig"), "kvittering.txt")})
+        name = resp.get_json()["attachment"]
+
+        resp = self.client.get(f"/uploads/{name}", headers=alice)
+        self.assertEqual(resp.data, b"hemmelig")
+        resp.close()
+        self.assertEqual(self.client.get(f"/uploads/{name}", headers={"X-Todo-Tenant": "bob"}).status_code, 404)
+        self.assertEqual(self.client.get(f"/uploads/{name}").status_code, 404)
+
+    def test_basic_auth_email_is_a_valid_tenant(self):
+        from base64 import b64encode
+
+        auth = {"Authorization": "Basic " + b64encode(b"alice@example.com:x").decode()}
+        resp = self.client.post("/api/todos", json={"text": "Alice"}, headers=auth)
+        self.assertEqual(resp.status_code, 201)
+        self.assertEqual([t["text"] for t in self.client.get("/api/todos", headers=auth).get_json()], ["Alice"])
+        self.assertEqual(self.texts("default"), [])
+
+    def test_import_clamps_batch_size(self):
+        import todo.importer as importer
+
+        seen = []
+        original = importer.import_todos
+        self.addCleanup(setattr, self.app_module, "import_todos", original)
+        self.app_module.import_todos = lambda manager, stream, fmt, batch_size: (
+            seen.append(batch_size) or original(manager, stream, fmt=fmt, batch_size=batch_size))
+
+        resp = self.client.post("/api/todos/import?format=csv&batch_size=1000000000",
+                                data="text\nA\nB\n", content_type="text/csv")
+        self.assertEqual(resp.status_code, 201)
+        self.assertEqual(resp.get_json()["imported"], 2)
+        self.assertEqual(seen, [importer.DEFAULT_BATCH_SIZE])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+import sys
+import os
+import io
+import json
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import todo.todo as todo_module
+import main as cli
+
+TEST_DATA_FILE = "test_todos.json"
+
+
+class TestCli(unittest.TestCase):
+    def setUp(self):
+        todo_module.DATA_FILE = TEST_DATA_FILE
+        if os.path.exists(TEST_DATA_FILE):
+            os.remove(TEST_DATA_FILE)
+
+    def tearDown(self):
+        if os.path.exists(TEST_DATA_FILE):
+            os.remove(TEST_DATA_FILE)
+
+    def run_cli(self, *argv):
+        out = io.StringIO()
+        with redirect_stdout(out):
+            code = cli.main(list(argv))
+        return code, out.getvalue()
+
+    def test_add_and_list_json(self):
+        self.run_cli("add", "Køb mælk", "--category", "Indkøb", "--priority", "høj")
+        self.run_cli("add", "Rapport")
+        code, out = self.run_cli("list", "--json", "--category", "Indkøb")
+        self.assertEqual(code, 0)
+        todos = json.loads(out)
+        self.assertEqual(len(todos), 1)
+        self.assertEqual(todos[0]["priority"], "Høj")
+
+    def test_list_filters_are_normalized(self):
+        self.run_cli("add", "A", "--priority", "høj", "--category", "groceries")
+        _, out = self.run_cli("list", "--json", "--priority", "høj", "--category", "indkøb")
+        self.assertEqual(len(json.loads(out)), 1)
+        code, _ = self.run_cli("list", "--category", "Hobby")
+        self.assertEqual(code, 1)
+
+    def test_export_json_summary(self):
+        self.run_cli("add", "A")
+        path = TEST_DATA_FILE + ".csv"
+        self.addCleanup(os.remove, path)
+        code, out = self.run_cli("export", path, "--json")
+        self.assertEqual(code, 0)
+        self.assertEqual(json.loads(out), {"exported": 1, "file": path, "format": "csv"})
+
+    def test_done_and_filters(self):
+        self.run_cli("add", "A")
+        self.run_cli("add", "B")
+        code, _ = self.run_cli("done", "1")
+        self.assertEqual(code, 0)
+        _, out = self.run_cli("list", "--active", "--json")
+        self.assertEqual([t["id"] for t in json.loads(out)], [2])
+
+    def test_not_found(self):
+        code, out = self.run_cli("rm", "42", "--json")
+        self.assertEqual(code, 1)
+        self.assertEqual(json.loads(out)["error"], "not found")
+
+    def test_invalid_deadline_and_category_are_rejected(self):
+        self.run_cli("add", "A", "--deadline", "2026-05-01", "--category", "Privat")
+        code, _ = self.run_cli("edit", "1", "--deadline", "bad")
+        self.assertEqual(code, 1)
+        code, _ = self.run_cli("edit", "1", "--category", "Ukendt")
+        self.assertEqual(code, 1)
+        code, _ = self.run_cli("add", "B", "--deadline", "next week")
+        self.assertEqual(code, 1)
+        _, out = self.run_cli("list", "--json")
+        todos = json.loads(out)
+        self.assertEqual(len(todos), 1)
+        self.assertEqual((todos[0]["deadline"], todos[0]["category"]), ("2026-05-01", "Privat"))
+
+    def test_negative_limit_is_rejected(self):
+        with redirect_stderr(io.StringIO()), self.assertRaises(SystemExit) as ctx:
+            cli.main(["list", "--limit", "-1"])
+        self.assertEqual(ctx.exception.code, 2)
+
+    def test_invalid_priority(self):
+        code, _ = self.run_cli("add", "A", "--priority", "Kritisk")
+        self.assertEqual(code, 1)
+        self.assertFalse(os.path.exists(TEST_DATA_FILE))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+import sys
+import os
+import io
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import todo.todo as todo_module
+from todo import TodoManager
+from todo.importer import import_todos, normalize_row, detect_format, ImportFormatError
+
+TEST_DATA_FILE = "test_todos.json"
+
+
+class TestImport(unittest.TestCase):
+    def setUp(self):
+        todo_module.DATA_FILE = TEST_DATA_FILE
+        if os.path.exists(TEST_DATA_FILE):
+            os.remove(TEST_DATA_FILE)
+        self.manager = TodoManager()
+
+    def tearDown(self):
+        if os.path.exists(TEST_DATA_FILE):
+            os.remove(TEST_DATA_FILE)
+
+    def test_normalize_row(self):
+        row = normalize_row({"text": " Køb mælk ", "priority": "høj", "category": "groceries", "deadline": "2026-05-01T10:00:00"})
+        self.assertEqual(row["text"], "Køb mælk")
+        self.assertEqual(row["priority"], "Høj")
+        self.assertEqual(row["category"], "Indkøb")
+        self.assertEqual(row["deadline"], "2026-05-01")
+
+    def test_normalize_api_priority(self):
+        self.assertEqual(normalize_row({"text": "x", "priority": 4})["priority"], "Høj")
+        self.assertEqual(normalize_row({"text": "x", "priority": "1"})["priority"], "Lav")
+
+    def test_normalize_invalid(self):
+        with self.assertRaises(ImportFormatError):
+            normalize_row({"text": ""})
+        with self.assertRaises(ImportFormatError):
+            normalize_row({"text": "x", "priority": "Kritisk"})
+
+    def test_import_csv_in_batches(self):
+        data = "text,priority,category,done\nA,Lav,Arbejde,\nB,,,true\nC,Høj,Privat,\n"
+        result = import_todos(self.manager, io.StringIO(data), fmt="csv", batch_size=2)
+        self.assertEqual(result["imported"], 3)
+        self.assertTrue(result["success"])
+        todos = TodoManager().list()
+        self.assertEqual([t["id"] for t in todos], [1, 2, 3])
+        self.assertTrue(todos[1]["done"])
+        self.assertEqual(todos[2]["category"], "Privat")
+
+    def test_import_ndjson_skips_bad_rows(self):
+        data = '{"text": "A"}\nikke json\n{"text": ""}\n\n{"text": "B", "priority": 3}\n'
+        result = import_todos(self.manager, io.StringIO(data), fmt="ndjson")
+        self.assertEqual(result["imported"], 2)
+        self.assertEqual(result["skipped"], 2)
+        self.assertFalse(result["success"])
+        self.assertEqual(len(result["errors"]), 2)
+
+    def test_import_reports_invalid_category_and_deadline(self):
+        data = "text,category,deadline\nA,Hobby,\nB,,2026-13-01\nC,Privat,2026-05-01T10:00:00\n"
+        result = import_todos(self.manager, io.StringIO(data), fmt="csv")
+        self.assertEqual(result["imported"], 1)
+        self.assertEqual(result["skipped"], 2)
+        self.assertFalse(result["success"])
+        self.assertIn("Hobby", result["errors"][0])
+        self.assertEqual(TodoManager().list()[0]["deadline"], "2026-05-01")
+
+    def test_import_todoist_backup(self):
+        data = (
+            "TYPE,CONTENT,DESCRIPTION,PRIORITY,INDENT,AUTHOR,RESPONSIBLE,DATE,DATE_LANG,TIMEZONE\n"
+            "section,Sektion,,,,,,,,\n"
+            "task,Ring til tandlæge,,1,1,,,2026-03-01,en,\n"
+            "task,Læs bog,,4,1,,,every monday,en,\n"
+        )
+        result = import_todos(self.manager, io.StringIO(data), fmt="csv")
+        self.assertEqual(result["imported"], 2)
+        todos = self.manager.list()
+        self.assertEqual(todos[0]["priority"], "Høj")
+        self.assertEqual(todos[0]["deadline"], "2026-03-01")
+        self.assertEqual(todos[1]["priority"], "Lav")
+        self.assertEqual(todos[1]["deadline"], "")
+
+    def test_json_array_is_rejected_before_writing(self):
+        self.manager.add("A")
+        self.manager.add("B")
+        with open(TEST_DATA_FILE, "r", encoding="utf-8") as f:
+            data = f.read()
+        with self.assertRaises(ImportFormatError):
+            detect_format("backup.json")
+        with self.assertRaises(ImportFormatError):
+            import_todos(self.manager, io.StringIO(data), fmt="ndjson")
+        self.assertEqual([t["text"] for t in TodoManager().list()], ["A", "B"])
+
+    def test_import_csv_without_text_column(self):
+        with self.assertRaises(ImportFormatError):
+            import_todos(self.manager, io.StringIO("navn\nA\n"), fmt="csv")
+
+
+if __name__ == "__main__":
+    unittest.main()
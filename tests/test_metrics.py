@@ -0,0 +1,65 @@
+import sys
+import os
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import todo.todo as todo_module
+from todo import TodoManager
+from todo.metrics import Registry
+
+TEST_DATA_FILE = "test_todos.json"
+
+
+class TestMetrics(unittest.TestCase):
+    def test_counter_render(self):
+        registry = Registry()
+        requests = registry.counter("requests_total", "Requests.", ["method"])
+        requests.inc(method="GET")
+        requests.inc(2, method="GET")
+        text = registry.render()
+        self.assertIn("# TYPE requests_total counter", text)
+        self.assertIn('requests_total{method="GET"} 3', text)
+
+    def test_histogram_buckets(self):
+        registry = Registry()
+        latency = registry.histogram("latency_seconds", "Latency.", buckets=(0.1, 1.0))
+        latency.observe(0.05)
+        latency.observe(0.5)
+        latency.observe(5)
+        text = registry.render()
+        self.assertIn('latency_seconds_bucket{le="0.1"} 1', text)
+        self.assertIn('latency_seconds_bucket{le="1"} 2', text)
+        self.assertIn('latency_seconds_bucket{le="+Inf"} 3', text)
+        self.assertIn("latency_seconds_count 3", text)
+        self.assertEqual(latency.count(), 3)
+        self.assertAlmostEqual(latency.sum(), 5.55)
+
+    def test_wrong_labels(self):
+        registry = Registry()
+        requests = registry.counter("requests_total", "Requests.", ["method"])
+        with self.assertRaises(ValueError):
+            requests.inc(route="/")
+
+    def test_label_escaping(self):
+        registry = Registry()
+        requests = registry.counter("requests_total", "Requests.", ["route"])
+        requests.inc(route='a"b')
+        self.assertIn('requests_total{route="a\\"b"} 1', registry.render())
+
+    def test_storage_instrumented(self):
+        todo_module.DATA_FILE = TEST_DATA_FILE
+        try:
+            saves = todo_module.SAVE_SECONDS.count()
+            written = todo_module.BYTES_WRITTEN.value()
+            manager = TodoManager()
+            manager.add("Måles")
+            self.assertEqual(todo_module.SAVE_SECONDS.count(), saves + 1)
+            self.assertEqual(todo_module.BYTES_WRITTEN.value(), written + os.path.getsize(TEST_DATA_FILE))
+        finally:
+            if os.path.exists(TEST_DATA_FILE):
+                os.remove(TEST_DATA_FILE)
+
+
+if __name__ == "__main__":
+    unittest.main()
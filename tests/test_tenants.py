@@ -0,0 +1,107 @@
+import sys
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import todo.todo as todo_module
+from todo import TodoManager
+from todo.tenants import TenantManagers, InvalidTenantError, shard_path, upload_dir, tenant_for_user
+
+TEST_DATA_FILE = "test_todos.json"
+
+
+class TestTenantManagers(unittest.TestCase):
+    def setUp(self):
+        todo_module.DATA_FILE = TEST_DATA_FILE
+        self.data_dir = tempfile.mkdtemp()
+        self.tenants = TenantManagers(data_dir=self.data_dir, max_open=2, idle_seconds=600)
+
+    def tearDown(self):
+        shutil.rmtree(self.data_dir, ignore_errors=True)
+        if os.path.exists(TEST_DATA_FILE):
+            os.remove(TEST_DATA_FILE)
+
+    def test_tenants_are_isolated(self):
+        with self.tenants.checkout("alice") as manager:
+            manager.add("Alice")
+        with self.tenants.checkout("bob") as manager:
+            self.assertEqual(manager.list(), [])
+            manager.add("Bob")
+        self.assertTrue(os.path.exists(shard_path(self.data_dir, "alice")))
+        alice = TodoManager(data_file=shard_path(self.data_dir, "alice"))
+        self.assertEqual([t["text"] for t in alice.list()], ["Alice"])
+
+    def test_tenant_for_user(self):
+        self.assertEqual(tenant_for_user("alice"), "alice")
+        key = tenant_for_user("alice@example.com")
+        self.assertNotEqual(key, tenant_for_user("bob@example.com"))
+        with self.tenants.checkout(key) as manager:
+            manager.add("Alice")
+
+    def test_upload_dir_is_per_tenant(self):
+        self.assertEqual(upload_dir("uploads", "default"), "uploads")
+        alice = upload_dir("uploads", "alice")
+        self.assertEqual(os.path.dirname(os.path.dirname(alice)), os.path.join("uploads", "tenants"))
+        self.assertNotEqual(alice, upload_dir("uploads", "bob"))
+        with self.assertRaises(InvalidTenantError):
+            upload_dir("uploads", "../alice")
+
+    def test_default_tenant_uses_data_file(self):
+        with self.tenants.checkout("default") as manager:
+            manager.add("Delt")
+        self.assertEqual(TodoManager().list()[0]["text"], "Delt")
+
+    def test_invalid_tenant(self):
+        with self.assertRaises(InvalidTenantError):
+            with self.tenants.checkout("../etc"):
+                pass
+
+    def test_lru_eviction(self):
+        for name in ("a", "b", "c"):
+            with self.tenants.checkout(name) as manager:
+                manager.add(name)
+        self.assertEqual(len(self.tenants), 2)
+        # Evicted tenant genindlæses fra disk
+        with self.tenants.checkout("a") as manager:
+            self.assertEqual(manager.list()[0]["text"], "a")
+
+    def test_idle_eviction(self):
+        self.tenants.idle_seconds = 0
+        with self.tenants.checkout("a"):
+            pass
+        self.tenants.evict_idle()
+        self.assertEqual(len(self.tenants), 0)
+
+    def test_other_tenant_not_blocked(self):
+        entered = threading.Event()
+        release = threading.Event()
+
+        def hold_alice():
+            with self.tenants.checkout("alice"):
+                entered.set()
+                release.wait(5)
+
+        thread = threading.Thread(target=hold_alice)
+        thread.start()
+        entered.wait(5)
+        try:
+            done = threading.Event()
+
+            def use_bob():
+                with self.tenants.checkout("bob") as manager:
+                    manager.add("Bob")
+                done.set()
+
+            threading.Thread(target=use_bob).start()
+            self.assertTrue(done.wait(5))
+        finally:
+            release.set()
+            thread.join()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,5 +1,6 @@
 import sys
 import os
+import json
 import unittest
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
@@ -33,6 +34,40 @@ class TestTodoManager(unittest.TestCase):
         self.assertEqual(second["id"], 2)
         self.assertEqual(len(self.manager.list()), 2)
 
+    def test_add_many(self):
+        self.manager.add("Første")
+        count = self.manager.add_many([{"text": "A"}, {"text": "B", "priority": "Høj"}])
+        self.assertEqual(count, 2)
+        ids = [t["id"] for t in self.manager.list()]
+        self.assertEqual(ids, [1, 2, 3])
+        self.assertEqual(self.manager.list()[2]["priority"], "Høj")
+        self.assertEqual(len(TodoManager().list()), 3)
+
+    def test_loaded_changes_write_single_lines(self):
+        self.manager.add_many([{"text": "A"}, {"text": "B"}, {"text": "C"}])
+        manager = TodoManager()
+        manager._save = lambda: self.fail("hele store'et blev skrevet om")
+        manager.edit(2, new_text="B2")
+        manager.toggle_done(1)
+        manager.delete(3)
+        manager.add("D")
+        todos = TodoManager().list()
+        self.assertEqual([(t["id"], t["text"], t["done"]) for t in todos],
+                         [(1, "A", True), (2, "B2", False), (3, "D", False)])
+
+    def test_add_many_appends_without_loading(self):
+        self.manager.add_many([{"text": "A"}, {"text": "B"}])
+        lazy = TodoManager(lazy=True)
+        self.assertEqual(lazy.add_many([{"text": "C"}]), 1)
+        self.assertIsNone(lazy._todos)
+        self.assertEqual([t["id"] for t in TodoManager().list()], [1, 2, 3])
+
+    def test_add_many_converts_legacy_file(self):
+        with open(TEST_DATA_FILE, "w", encoding="utf-8") as f:
+            json.dump([{"id": 1, "text": "Gammel", "done": False}], f, indent=2)
+        TodoManager(lazy=True).add_many([{"text": "Ny"}])
+        self.assertEqual([t["text"] for t in TodoManager().list()], ["Gammel", "Ny"])
+
     def test_list_empty(self):
         self.assertEqual(self.manager.list(), [])
 
@@ -76,6 +111,37 @@ class TestTodoManager(unittest.TestCase):
         self.assertEqual(len(new_manager.list()), 1)
         self.assertEqual(new_manager.list()[0]["text"], "Persistens test")
 
+    def test_lazy_add_appends_without_loading(self):
+        self.manager.add("A")
+        self.manager.add("B")
+        lazy = TodoManager(lazy=True)
+        todo = lazy.add("C")
+        self.assertEqual(todo["id"], 3)
+        self.assertIsNone(lazy._todos)
+        self.assertEqual([t["text"] for t in TodoManager().list()], ["A", "B", "C"])
+
+    def test_lazy_complete_edit_delete(self):
+        for text in ("A", "B", "C"):
+            self.manager.add(text)
+        lazy = TodoManager(lazy=True)
+        self.assertTrue(lazy.complete(2)["done"])
+        self.assertEqual(lazy.edit(3, "Ny")["text"], "Ny")
+        self.assertEqual(lazy.delete(1)["text"], "A")
+        self.assertIsNone(lazy.delete(99))
+        self.assertIsNone(lazy._todos)
+        todos = TodoManager().list()
+        self.assertEqual([t["id"] for t in todos], [2, 3])
+        self.assertTrue(todos[0]["done"])
+
+    def test_legacy_indented_file(self):
+        with open(TEST_DATA_FILE, "w", encoding="utf-8") as f:
+            json.dump([{"id": 1, "text": "Gammel", "done": False}], f, indent=2)
+        lazy = TodoManager(lazy=True)
+        self.assertEqual(lazy.add("Ny")["id"], 2)
+        todos = TodoManager().list()
+        self.assertEqual(len(todos), 2)
+        self.assertEqual(todos[0]["priority"], "Medium")
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,111 @@
+import sys
+import os
+import json
+import unittest
+import urllib.error
+import urllib.request
+
+ROOT = os.path.join(os.path.dirname(__file__), "..")
+sys.path.insert(0, os.path.join(ROOT, "src"))
+sys.path.insert(0, ROOT)
+
+from benchmarks.todoist_stub import StubTodoist, route_name
+from benchmarks.sync_load import check_consistency
+
+
+class TestStubTodoist(unittest.TestCase):
+    def setUp(self):
+        self.stub = StubTodoist().start()
+
+    def tearDown(self):
+        self.stub.stop()
+
+    def call(self, method, path, body=None):
+        data = json.dumps(body).encode("utf-8") if body is not None else None
+        req = urllib.request.Request(self.stub.base_url + path, data=data, method=method,
+                                     headers={"Content-Type": "application/json"})
+        try:
+            with urllib.request.urlopen(req, timeout=5) as resp:
+                raw = resp.read()
+                return resp.status, json.loads(raw) if raw else None, resp.headers
+        except urllib.error.HTTPError as e:
+            raw = e.read()
+            return e.code, json.loads(raw) if raw else None, e.headers
+
+    def test_task_lifecycle(self):
+        status, task, _ = self.call("POST", "/tasks", {"content": "Køb mælk", "due_date": "2026-05-01"})
+        self.assertEqual(status, 200)
+        self.assertEqual(task["due"]["date"], "2026-05-01")
+        tid = task["id"]
+
+        self.call("POST", f"/tasks/{tid}", {"content": "Køb havremælk"})
+        self.assertEqual(self.call("GET", f"/tasks/{tid}")[1]["content"], "Køb havremælk")
+
+        self.assertEqual(self.call("POST", f"/tasks/{tid}/close")[0], 204)
+        self.assertEqual(self.call("GET", "/tasks")[1], [])
+        self.assertEqual(self.call("POST", f"/tasks/{tid}/reopen")[0], 204)
+        self.assertEqual(len(self.call("GET", "/tasks")[1]), 1)
+        self.assertEqual(self.call("DELETE", f"/tasks/{tid}")[0], 204)
+        self.assertEqual(self.call("GET", f"/tasks/{tid}")[0], 404)
+
+        self.assertEqual(self.stub.route_counts["POST /tasks/<id>"], 1)
+        self.assertEqual(self.stub.request_count, 9)
+
+    def test_seed_is_reproducible(self):
+        self.stub.seed(50)
+        other = StubTodoist()
+        other.seed(50)
+        other._server.server_close()
+        self.assertEqual(self.stub.tasks, other.tasks)
+        self.assertEqual(len(self.call("GET", "/tasks")[1]), 50)
+        self.assertEqual(len(self.call("GET", "/projects")[1]), 4)
+
+    def test_rate_limit_sends_retry_after(self):
+        self.stub.rate_limit_rate = 1.0
+        self.stub.retry_after = 7
+        status, _, headers = self.call("POST", "/tasks", {"content": "X"})
+        self.assertEqual(status, 429)
+        self.assertEqual(headers["Retry-After"], "7")
+        # Injicerede fejl udføres ikke
+        self.assertEqual(self.stub.tasks, {})
+        self.assertEqual(self.stub.faults[429], 1)
+
+    def test_error_rate(self):
+        self.stub.error_rate = 0.5
+        statuses = [self.call("GET", "/projects")[0] for _ in range(40)]
+        failures = [s for s in statuses if s >= 500]
+        self.assertTrue(0 < len(failures) < 40)
+        self.assertEqual(sum(self.stub.faults.values()), len(failures))
+
+    def test_route_name(self):
+        self.assertEqual(route_name("POST", "/tasks/42/close"), "POST /tasks/<id>/close")
+        self.assertEqual(route_name("GET", "/projects"), "GET /projects")
+
+
+class TestCheckConsistency(unittest.TestCase):
+    def setUp(self):
+        self.stub = StubTodoist()
+        self.stub._server.server_close()
+        self.stub.tasks = {"1": {"id": "1", "content": "A"}, "2": {"id": "2", "content": "B 📎 Har lokal fil: x.pdf"}}
+
+    def test_in_sync(self):
+        todos = [
+            {"id": 1, "text": "A", "done": False, "todoist_id": "1"},
+            {"id": 2, "text": "B", "done": False, "todoist_id": "2"},
+            {"id": 3, "text": "C", "done": True, "todoist_id": ""},
+        ]
+        self.assertEqual(check_consistency(todos, self.stub), [])
+
+    def test_reports_problems(self):
+        todos = [
+            {"id": 1, "text": "A ændret", "done": False, "todoist_id": "1"},
+            {"id": 3, "text": "C", "done": True, "todoist_id": "9"},
+            {"id": 4, "text": "D", "done": False, "todoist_id": ""},
+        ]
+        problems = check_consistency(todos, self.stub)
+        self.assertEqual(len(problems), 4)
+        self.assertTrue(any("Task 2 findes ikke lokalt" in p for p in problems))
+
+
+if __name__ == "__main__":
+    unittest.main()